@@ -0,0 +1,193 @@
+import re
+import time
+from dataclasses import dataclass, field
+
+# --- BLOCK SIGNALS ---
+# Every signal is checked inside ONE page.evaluate() call instead of one
+# round-trip per selector. Only visible matches count: normal pages embed
+# hidden captcha markup too, e.g. the invisible reCAPTCHA v3 badge.
+CAPTCHA_SELECTORS = [
+    'iframe[src*="captcha"]',
+    'iframe[src*="recaptcha"]',
+    'iframe[src*="hcaptcha"]',
+    'iframe[src*="challenges.cloudflare.com"]',
+    '.g-recaptcha',
+    '.h-captcha',
+    '#captcha',
+    '[class*="captcha"]',
+    '[id*="captcha"]',
+    '#challenge-form',
+    '#cf-challenge-running',
+]
+
+# Containers whose captcha markup appears on ordinary, unblocked pages
+IGNORED_CAPTCHA = '.grecaptcha-badge'
+
+BLOCK_PHRASES = [
+    "verify you are human",
+    "are you a robot",
+    "unusual traffic",
+    "access denied",
+    "request blocked",
+    "additional verification required",
+    "checking your browser",
+    "please enable cookies",
+]
+
+BLOCK_TITLES = [
+    "just a moment",
+    "attention required",
+    "access denied",
+    "security check",
+    "hcaptcha",
+]
+
+DETECT_JS = """([selectors, ignored, phrases, titles]) => {
+    const visible = (el) => {
+        if (el.closest(ignored)) return false;
+        const rect = el.getBoundingClientRect();
+        if (!rect.width || !rect.height) return false;
+        const style = getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0';
+    };
+    for (const sel of selectors) {
+        try {
+            for (const el of document.querySelectorAll(sel)) {
+                if (visible(el)) return {kind: 'captcha', detail: sel};
+            }
+        } catch (e) {}
+    }
+    const title = (document.title || '').toLowerCase();
+    for (const t of titles) {
+        if (title.includes(t)) return {kind: 'title', detail: t};
+    }
+    const body = document.body ? document.body.innerText.slice(0, 5000).toLowerCase() : '';
+    for (const p of phrases) {
+        if (body.includes(p)) return {kind: 'text', detail: p};
+    }
+    return null;
+}"""
+
+DETECT_ARGS = [CAPTCHA_SELECTORS, IGNORED_CAPTCHA, BLOCK_PHRASES, BLOCK_TITLES]
+
+
+@dataclass
+class BlockSignal:
+    kind: str      # 'captcha', 'title', 'text', 'status' or 'error' (a retry that failed to load)
+    detail: str
+    url: str = ""
+
+    def __str__(self):
+        return f"{self.kind}: {self.detail}"
+
+
+def _to_signal(result, url):
+    if not result:
+        return None
+    return BlockSignal(result['kind'], result['detail'], url)
+
+
+TITLE_PATTERN = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r"<(script|style)\b.*?</\1>|<[^>]+>", re.IGNORECASE | re.DOTALL)
+
+
+def body_signal(html, url=""):
+    """Title/phrase checks of DETECT_JS on a raw response body (no DOM, e.g. APIRequestContext)"""
+    match = TITLE_PATTERN.search(html)
+    title = match.group(1).strip().lower() if match else ""
+    for t in BLOCK_TITLES:
+        if t in title:
+            return BlockSignal('title', t, url)
+    body = " ".join(TAG_PATTERN.sub(" ", html).split())[:5000].lower()
+    for p in BLOCK_PHRASES:
+        if p in body:
+            return BlockSignal('text', p, url)
+    return None
+
+
+def load_failure(url="", detail="page failed to load"):
+    """Signal for a quarantined page whose retry did not load, so it is re-queued or counted as dropped"""
+    return BlockSignal('error', detail, url)
+
+
+def status_signal(response):
+    """Treat 403/429/503 navigation responses as a block"""
+    if response is not None and response.status in (403, 429, 503):
+        return BlockSignal('status', str(response.status), response.url)
+    return None
+
+
+async def detect_block(page, response=None):
+    """Check all block signals on an async Playwright page in one evaluation"""
+    signal = status_signal(response)
+    if signal:
+        return signal
+    try:
+        return _to_signal(await page.evaluate(DETECT_JS, DETECT_ARGS), page.url)
+    except Exception:
+        return None
+
+
+def detect_block_sync(page, response=None):
+    """Same as detect_block() for the sync Playwright API"""
+    signal = status_signal(response)
+    if signal:
+        return signal
+    try:
+        return _to_signal(page.evaluate(DETECT_JS, DETECT_ARGS), page.url)
+    except Exception:
+        return None
+
+
+# --- QUARANTINE ---
+BLOCK_COOLDOWN = 60.0  # default seconds before a blocked task is retried, doubled per attempt
+
+
+@dataclass
+class QuarantinedTask:
+    task: object
+    signal: BlockSignal
+    attempts: int
+    retry_at: float
+
+
+@dataclass
+class Quarantine:
+    """Holds blocked tasks for a later retry so the rest of the crawl keeps going"""
+    cooldown: float = BLOCK_COOLDOWN
+    max_attempts: int = 3
+    backoff: float = 2.0
+    tasks: list = field(default_factory=list)
+    dropped: list = field(default_factory=list)
+    _attempts: dict = field(default_factory=dict)
+
+    def add(self, task, signal):
+        """Quarantine a task; returns False once it has used up its retries"""
+        attempts = self._attempts.get(task, 0) + 1
+        self._attempts[task] = attempts
+        if attempts > self.max_attempts:
+            self.dropped.append(QuarantinedTask(task, signal, attempts, 0.0))
+            return False
+        delay = self.cooldown * (self.backoff ** (attempts - 1))
+        self.tasks.append(QuarantinedTask(task, signal, attempts, time.monotonic() + delay))
+        return True
+
+    def due(self):
+        """Pop and return the tasks whose cooldown has expired"""
+        now = time.monotonic()
+        ready = [q.task for q in self.tasks if q.retry_at <= now]
+        self.tasks = [q for q in self.tasks if q.retry_at > now]
+        return ready
+
+    def next_retry_in(self):
+        """Seconds until the next quarantined task becomes due (None if empty)"""
+        if not self.tasks:
+            return None
+        return max(0.0, min(q.retry_at for q in self.tasks) - time.monotonic())
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def summary(self):
+        return (f"{len(self.tasks)} waiting for retry, "
+                f"{len(self.dropped)} dropped after {self.max_attempts} attempts")
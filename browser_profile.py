@@ -0,0 +1,212 @@
+"""Persistent browser profile with an HTTP disk cache shared across runs.
+
+browser.new_context() contexts are incognito, so every run (and every
+recycled context) downloads the sites' JS bundles, CSS, fonts and images
+again. With --profile the scrapers launch one persistent context on a
+user-data directory instead; its disk cache survives restarts, so
+steady-state page loads only fetch the dynamic HTML/JSON.
+
+Concurrent workers share a profile safely: the first takes an exclusive
+lock and uses (and refreshes) the master directory, the others start from a
+throwaway copy of it and read the warm cache without writing back. Cache
+hit ratios per resource class are printed when the browser closes.
+"""
+import os
+import shutil
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_PROFILE = ".cache/browser-profile"
+
+STATIC_TYPES = {"Script", "Stylesheet", "Image", "Font", "Media"}
+
+# Chromium's per-instance lock files, never copied into a snapshot
+SINGLETON_FILES = ("SingletonLock", "SingletonCookie", "SingletonSocket", "lockfile")
+
+
+def _try_lock(f):
+    """Non-blocking exclusive lock; raises OSError when another process holds it"""
+    if fcntl:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+
+
+class BrowserProfile:
+    """Master profile directory plus its lock; acquire() says which directory to launch on"""
+
+    def __init__(self, directory=DEFAULT_PROFILE):
+        self.directory = os.path.abspath(directory)
+        self.path = None
+        self.copied = False
+        self._lock = None
+
+    def acquire(self):
+        os.makedirs(os.path.dirname(self.directory), exist_ok=True)
+        lock = open(self.directory + ".lock", "a+")
+        try:
+            _try_lock(lock)
+        except OSError:
+            lock.close()
+            return self._snapshot()
+        self._lock = lock
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = self.directory
+        return self.path
+
+    def _snapshot(self):
+        # Copy-on-start: the master is live in another worker, so files may change
+        # mid-copy; Chromium rebuilds any cache entries that come out inconsistent
+        self.path = tempfile.mkdtemp(prefix="browser-profile-")
+        self.copied = True
+        if os.path.isdir(self.directory):
+            try:
+                shutil.copytree(self.directory, self.path, dirs_exist_ok=True,
+                                ignore=shutil.ignore_patterns(*SINGLETON_FILES))
+            except shutil.Error:
+                pass  # files that vanished while copying
+        print(f"🗂️  Profile {self.directory} is in use; this worker runs on a copy")
+        return self.path
+
+    def release(self):
+        if self.copied:
+            shutil.rmtree(self.path, ignore_errors=True)
+        if self._lock:
+            self._lock.close()  # closing the file drops the lock
+            self._lock = None
+
+
+class CacheStats:
+    """Counts cache hits from CDP Network events, split into static assets and dynamic requests"""
+
+    def __init__(self):
+        self.counts = {kind: {"requests": 0, "cached": 0, "revalidated": 0} for kind in ("static", "dynamic")}
+        self.network_bytes = 0
+        self._cached = set()
+
+    def attach(self, cdp):
+        cdp.on("Network.requestServedFromCache", lambda e: self._cached.add(e["requestId"]))
+        cdp.on("Network.responseReceived", self.on_response)
+        cdp.on("Network.loadingFinished", self.on_finished)
+
+    def on_response(self, event):
+        response = event["response"]
+        bucket = self.counts["static" if event.get("type") in STATIC_TYPES else "dynamic"]
+        bucket["requests"] += 1
+        if response.get("fromDiskCache") or event["requestId"] in self._cached:
+            bucket["cached"] += 1
+        elif response.get("status") == 304:
+            bucket["revalidated"] += 1
+
+    def on_finished(self, event):
+        if event["requestId"] not in self._cached:
+            self.network_bytes += event.get("encodedDataLength", 0)
+
+    def report(self):
+        parts = []
+        for kind, c in self.counts.items():
+            ratio = c["cached"] / c["requests"] if c["requests"] else 0.0
+            parts.append(f"{kind} {c['cached']}/{c['requests']} cached ({ratio:.0%}), {c['revalidated']} revalidated")
+        print(f"📦 HTTP cache: {'; '.join(parts)}; {self.network_bytes / (1024 * 1024):.1f} MB over the network")
+
+
+class ProfileBrowser:
+    """Stands in for a Browser: new_context() returns the one persistent context, launched on first use"""
+
+    def __init__(self, playwright, profile, **launch_options):
+        self.chromium = playwright.chromium
+        self.profile = profile
+        self.launch_options = launch_options
+        self.context = None
+        self.stats = CacheStats()
+
+    async def new_context(self, **options):
+        # Context options (user agent, viewport, locale...) are fixed by the first caller
+        if self.context is None:
+            self.context = await self.chromium.launch_persistent_context(
+                self.profile.acquire(), **self.launch_options, **options)
+            self.context.on("page", self._watch)
+        return self.context
+
+    async def _watch(self, page):
+        try:
+            cdp = await self.context.new_cdp_session(page)
+            self.stats.attach(cdp)
+            await cdp.send("Network.enable")
+        except Exception:
+            pass
+
+    async def close(self):
+        try:
+            if self.context:
+                await self.context.close()
+        finally:
+            self.profile.release()
+            self.stats.report()
+
+
+class ProfileBrowserSync(ProfileBrowser):
+    """Sync API twin"""
+
+    def new_context(self, **options):
+        if self.context is None:
+            self.context = self.chromium.launch_persistent_context(
+                self.profile.acquire(), **self.launch_options, **options)
+            self.context.on("page", self._watch)
+        return self.context
+
+    def _watch(self, page):
+        try:
+            cdp = self.context.new_cdp_session(page)
+            self.stats.attach(cdp)
+            cdp.send("Network.enable")
+        except Exception:
+            pass
+
+    def close(self):
+        try:
+            if self.context:
+                self.context.close()
+        finally:
+            self.profile.release()
+            self.stats.report()
+
+
+async def launch_browser(playwright, profile=None, **options):
+    """chromium.launch(**options), or a persistent-profile stand-in when profile is a directory"""
+    if not profile:
+        return await playwright.chromium.launch(**options)
+    return ProfileBrowser(playwright, BrowserProfile(profile), **options)
+
+
+def launch_browser_sync(playwright, profile=None, **options):
+    if not profile:
+        return playwright.chromium.launch(**options)
+    return ProfileBrowserSync(playwright, BrowserProfile(profile), **options)
+
+
+async def close_context(page):
+    """Drop a page's context; in a persistent profile only the page (the context is the whole run)"""
+    try:
+        if page.context.browser is None:
+            await page.close()
+        else:
+            await page.context.close()
+    except Exception:
+        pass
+
+
+def close_context_sync(page):
+    try:
+        if page.context.browser is None:
+            page.close()
+        else:
+            page.context.close()
+    except Exception:
+        pass
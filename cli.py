@@ -0,0 +1,190 @@
+"""Single entry point for all scrapers.
+
+    python cli.py indeed -q "python developer" -l Remote -p 10
+    python cli.py monster --config jobs.json --dry-run
+    python cli.py monster -l Remote -l "New York" --plan
+    python cli.py iim -q hr -q finance -p 5
+    python cli.py monster --plan --headless --queue crawl.db   # then: python crawl_runner.py crawl.db
+    python cli.py query python --mention aws --remote --min-salary 100000 --days 7
+
+Settings come from (highest first) the command line, the site's section of
+a JSON/TOML --config file, then the site plugin's defaults. Only the chosen
+subcommand's scraper (and pandas/Playwright with it) is ever imported.
+--plan probes the first page of every query x location and sizes each
+search's pagination from its result count and overlap (see planner.py).
+Every run is also upserted into the SQLite master store (jobs.db unless
+--store / --no-store).
+"""
+import argparse
+import json
+import sys
+
+from browser_profile import DEFAULT_PROFILE
+from sites import SITES
+
+
+def load_config(path):
+    """Read a JSON or TOML config file: {"indeed": {"queries": [...], "locations": [...], "pages": ...}}"""
+    if not path:
+        return {}
+    if path.endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="jobscrape", description="Job board scrapers")
+    subparsers = parser.add_subparsers(dest="site", required=True, metavar="SITE")
+
+    for name, site in SITES.items():
+        sub = subparsers.add_parser(name, help=site.help, description=site.help)
+        sub.add_argument("-q", "--query", action="append",
+                         help="search query / keyword (repeatable)")
+        sub.add_argument("-l", "--location", action="append", help="search location (repeatable)")
+        sub.add_argument("-p", "--pages", type=int, help="results pages per query")
+        sub.add_argument("-o", "--output", help="output CSV path")
+        sub.add_argument("-c", "--config", help="JSON or TOML config file")
+        sub.add_argument("--base-url", help="override the site's origin (e.g. a mock_server.py URL)")
+        sub.add_argument("--headless", action="store_true", help="run the browser headless")
+        sub.add_argument("--parse-workers", type=int,
+                         help="parser threads overlapping with page fetches (default: 2)")
+        sub.add_argument("--profile", nargs="?", const=DEFAULT_PROFILE, metavar="DIR",
+                         help=f"persistent browser profile reusing its HTTP cache across runs (default: {DEFAULT_PROFILE})")
+        sub.add_argument("--block-cooldown", type=float, metavar="SECONDS",
+                         help="wait before retrying a blocked page, doubled per attempt (default: 60)")
+        sub.add_argument("--store", help="SQLite master job store to upsert into (default: jobs.db)")
+        sub.add_argument("--no-store", action="store_true", help="only write the CSV output")
+        sub.add_argument("--import-csv", action="append", metavar="CSV",
+                         help="upsert an existing CSV snapshot into the store and exit (repeatable)")
+        sub.add_argument("--enrich", action="store_true",
+                         help="fetch detail pages of new jobs for the full description (saved to the CSV and the store)")
+        sub.add_argument("--enrich-workers", type=int, default=4, help="concurrent detail fetches")
+        sub.add_argument("--enrich-interval", type=float, default=1.0,
+                         help="minimum seconds between requests to one domain")
+        sub.add_argument("--plan", action="store_true",
+                         help="probe each search's first page and allocate pages where new results exist")
+        sub.add_argument("--queue", metavar="DB",
+                         help="add the planned page tasks to a crawl queue for crawl_runner.py and exit")
+        sub.add_argument("--dry-run", action="store_true",
+                         help="print the planned page fetches and exit without scraping")
+        site.add_arguments(sub)
+
+    query = subparsers.add_parser("query", help="search the collected jobs in the master store")
+    query.add_argument("text", nargs="?", help="words that must appear in the title or summary")
+    query.add_argument("--store", default="jobs.db", help="SQLite master job store (default: jobs.db)")
+    query.add_argument("--source", choices=sorted(SITES), help="only jobs from this site")
+    query.add_argument("--skill", action="append", help="required detected skill (repeatable)")
+    query.add_argument("--mention", action="append", help="term in skills, title or summary (repeatable)")
+    query.add_argument("--company")
+    query.add_argument("--location")
+    query.add_argument("--keyword", help="search keyword the job was found with")
+    query.add_argument("--remote", action="store_true")
+    query.add_argument("--min-salary", type=float, help="annualised minimum")
+    query.add_argument("--max-salary", type=float, help="annualised maximum")
+    query.add_argument("--days", type=int, help="posted within the last N days")
+    query.add_argument("--limit", type=int, default=20)
+
+    return parser
+
+
+def run_query(args):
+    import time
+    from job_query import JobIndex
+    from job_store import JobStore
+
+    with JobStore(args.store) as store:
+        started = time.perf_counter()
+        index = JobIndex.from_store(store, args.source)
+        built = time.perf_counter()
+    rows = index.query(text=args.text, skills=args.skill, mentions=args.mention,
+                       company=args.company, location=args.location, keyword=args.keyword,
+                       remote=args.remote, min_salary=args.min_salary, max_salary=args.max_salary,
+                       since_days=args.days, limit=args.limit)
+    done = time.perf_counter()
+
+    for row in rows:
+        title = row.get("Title") or row.get("title")
+        company = row.get("Company") or row.get("company")
+        location = row.get("Location") or row.get("location")
+        print(f"[{row['source']}] {title} | {company} | {location} | {row['job_key']}")
+    print(f"{len(rows)} result(s); index of {len(index)} jobs built in {built - started:.2f}s, "
+          f"query took {(done - built) * 1000:.1f}ms")
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.site == "query":
+        return run_query(args)
+
+    site = SITES[args.site]
+    settings = site.settings(args, load_config(args.config))
+
+    if args.plan and not args.import_csv:
+        from planner import plan_searches
+        store = None
+        if settings["store"]:
+            from job_store import JobStore
+            store = JobStore(settings["store"])
+        try:
+            settings["page_plan"] = plan_searches(site, settings, store)
+        finally:
+            if store:
+                store.close()
+
+    if args.dry_run:
+        tasks = site.plan(settings)
+        print(f"{site.name}: {len(settings['queries'])} queries x {len(settings['locations'])} locations, "
+              f"up to {settings['pages']} pages = {len(tasks)} page fetches "
+              f"-> {settings['output'] or '(default output)'}")
+        for query, location, page in tasks:
+            print(f"  {query!r} @ {location or '-'} page {page}")
+        return 0
+
+    if args.queue:
+        from crawl_queue import TaskQueue
+        with TaskQueue(args.queue) as queue:
+            queue.configure(site.name, settings)
+            tasks = site.plan(settings)
+            added = queue.enqueue(site.name, tasks)
+        print(f"{site.name}: queued {added} new page tasks ({len(tasks) - added} already queued) in {args.queue}")
+        return 0
+
+    if args.import_csv:
+        from job_store import JobStore, import_csv
+        with JobStore(settings["store"] or "jobs.db") as store:
+            for path in args.import_csv:
+                import_csv(store, site.name, path)
+        return 0
+
+    rows = site.run(settings)
+    if not rows:
+        return 0
+
+    store = None
+    if settings["store"]:
+        from job_store import JobStore
+        store = JobStore(settings["store"])
+    try:
+        if args.enrich:
+            import asyncio
+            from enrichment import enrich_rows, new_rows
+            # Only jobs the store has not seen yet get their detail page fetched
+            todo = new_rows(store, site.name, rows) if store else rows
+            asyncio.run(enrich_rows(site.name, todo, workers=args.enrich_workers,
+                                    min_interval=args.enrich_interval))
+            # site.run() wrote the CSV before the detail pages were fetched
+            site.save(rows, settings["output"])
+        if store:
+            store.upsert(site.name, rows)
+    finally:
+        if store:
+            store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
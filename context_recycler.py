@@ -0,0 +1,157 @@
+"""Browser context recycling with memory / latency watermarks.
+
+Long crawls that reuse one page let Chromium renderer memory grow and
+navigations slow down. After each results page the recycler samples CDP
+Performance metrics (JS heap, DOM nodes) and the page's navigation timing;
+once a watermark is crossed it closes the context and asks the scraper's
+own new_page() factory for a fresh one, which re-applies init scripts and
+headers. The async recycler is for Indeed/IIM, RecyclerSync for Monster.
+"""
+from collections import deque
+from dataclasses import dataclass
+
+from browser_profile import close_context, close_context_sync
+
+NAV_TIMING_JS = """() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    return nav ? nav.domContentLoadedEventEnd : null;
+}"""
+
+
+@dataclass
+class Watermarks:
+    max_heap_mb: float = 256.0          # JSHeapUsedSize
+    max_nodes: int = 150000             # live DOM nodes
+    max_navigations: int = 60           # hard cap per context
+    latency_factor: float = 2.0         # rolling latency vs the context's first pages
+    max_latency_ms: float = 20000.0     # absolute rolling-latency ceiling
+    window: int = 5                     # navigations in the rolling latency window
+
+
+class _Tracker:
+    """Per-context counters plus the recycle decision (no Playwright calls)"""
+
+    def __init__(self, watermarks):
+        self.watermarks = watermarks
+        self.page = None
+        self.reset(None)
+        self.recycles = 0
+
+    def reset(self, page):
+        self.page = page
+        self.navigations = 0
+        self.baseline = None
+        self.recent = deque(maxlen=self.watermarks.window)
+
+    def record(self, page, latency_ms):
+        if page is not self.page:
+            # Page was replaced elsewhere (e.g. a quarantined context): start over
+            self.reset(page)
+        self.navigations += 1
+        if latency_ms:
+            self.recent.append(latency_ms)
+            if self.baseline is None and len(self.recent) == self.recent.maxlen:
+                self.baseline = sum(self.recent) / len(self.recent)
+
+    def reason(self, metrics):
+        w = self.watermarks
+        heap_mb = metrics.get("JSHeapUsedSize", 0) / (1024 * 1024)
+        if heap_mb > w.max_heap_mb:
+            return f"JS heap {heap_mb:.0f} MB > {w.max_heap_mb:.0f} MB"
+        if metrics.get("Nodes", 0) > w.max_nodes:
+            return f"{metrics['Nodes']:.0f} DOM nodes > {w.max_nodes}"
+        if self.navigations >= w.max_navigations:
+            return f"{self.navigations} navigations"
+        if len(self.recent) == self.recent.maxlen:
+            rolling = sum(self.recent) / len(self.recent)
+            if rolling > w.max_latency_ms:
+                return f"navigation latency {rolling:.0f} ms > {w.max_latency_ms:.0f} ms"
+            if self.baseline and self.navigations > 2 * w.window and rolling > self.baseline * w.latency_factor:
+                return f"navigation latency {rolling:.0f} ms vs {self.baseline:.0f} ms baseline"
+        return None
+
+
+def _metrics(result):
+    return {m["name"]: m["value"] for m in result.get("metrics", [])}
+
+
+class Recycler:
+    """Async: page = await recycler.after_navigation(page) after every results page"""
+
+    def __init__(self, new_page, watermarks=None):
+        self.new_page = new_page            # async callable returning a fresh stealth page
+        self.tracker = _Tracker(watermarks or Watermarks())
+        self.cdp = None
+
+    async def sample(self, page):
+        metrics, latency = {}, None
+        try:
+            if self.cdp is None or page is not self.tracker.page:
+                self.cdp = await page.context.new_cdp_session(page)
+                await self.cdp.send("Performance.enable")
+            metrics = _metrics(await self.cdp.send("Performance.getMetrics"))
+        except Exception:
+            self.cdp = None  # not Chromium, or the page went away
+        try:
+            latency = await page.evaluate(NAV_TIMING_JS)
+        except Exception:
+            pass
+        return metrics, latency
+
+    async def after_navigation(self, page):
+        metrics, latency = await self.sample(page)
+        self.tracker.record(page, latency)
+        reason = self.tracker.reason(metrics)
+        if not reason:
+            return page
+        return await self.recycle(page, reason)
+
+    async def recycle(self, page, reason):
+        print(f"♻️  Recycling browser context ({reason})")
+        await close_context(page)
+        self.cdp = None
+        self.tracker.recycles += 1
+        fresh = await self.new_page()
+        self.tracker.reset(fresh)
+        return fresh
+
+
+class RecyclerSync:
+    """Sync API twin: page = recycler.after_navigation(page)"""
+
+    def __init__(self, new_page, watermarks=None):
+        self.new_page = new_page
+        self.tracker = _Tracker(watermarks or Watermarks())
+        self.cdp = None
+
+    def sample(self, page):
+        metrics, latency = {}, None
+        try:
+            if self.cdp is None or page is not self.tracker.page:
+                self.cdp = page.context.new_cdp_session(page)
+                self.cdp.send("Performance.enable")
+            metrics = _metrics(self.cdp.send("Performance.getMetrics"))
+        except Exception:
+            self.cdp = None
+        try:
+            latency = page.evaluate(NAV_TIMING_JS)
+        except Exception:
+            pass
+        return metrics, latency
+
+    def after_navigation(self, page):
+        metrics, latency = self.sample(page)
+        self.tracker.record(page, latency)
+        reason = self.tracker.reason(metrics)
+        if not reason:
+            return page
+        return self.recycle(page, reason)
+
+    def recycle(self, page, reason):
+        print(f">>> Recycling browser context ({reason})")
+        close_context_sync(page)
+        self.cdp = None
+        self.tracker.recycles += 1
+        fresh = self.new_page()
+        self.tracker.reset(fresh)
+        return fresh
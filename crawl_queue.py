@@ -0,0 +1,184 @@
+"""Durable SQLite task queue for crawl_runner.py.
+
+One row per (site, query, location, page) task. A worker leases a task
+inside BEGIN IMMEDIATE (so two workers never get the same one), heartbeats
+while the page loads, then completes it with its rows or releases it with a
+retry delay. Leases that stop being renewed expire and go back to pending,
+so a crashed worker process or host never strands work.
+
+The file uses SQLite's default rollback journal rather than WAL: WAL needs
+shared memory and only works for processes on one host, while this queue
+may be shared by several machines over a filesystem with working locks.
+"""
+import json
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id            INTEGER PRIMARY KEY,
+    site          TEXT NOT NULL,
+    query         TEXT NOT NULL,
+    location      TEXT NOT NULL DEFAULT '',
+    page          INTEGER NOT NULL,
+    state         TEXT NOT NULL DEFAULT 'pending',   -- pending | leased | done | skipped | failed
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    available_at  REAL NOT NULL DEFAULT 0,
+    worker        TEXT,
+    lease_expires REAL,
+    error         TEXT,
+    UNIQUE (site, query, location, page)
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (state, available_at);
+CREATE TABLE IF NOT EXISTS results (
+    task_id     INTEGER PRIMARY KEY REFERENCES tasks (id),
+    site        TEXT NOT NULL,
+    rows        JSON NOT NULL,
+    worker      TEXT,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS sites (
+    site     TEXT PRIMARY KEY,
+    settings JSON NOT NULL
+);
+"""
+
+# Settings a worker or the merge step needs; the rest stays with the enqueuing CLI
+SHARED_SETTINGS = ("output", "store", "base_url", "headless", "profile", "block_cooldown")
+
+
+def worker_id():
+    """host:pid, unique across the machines sharing a queue"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class TaskQueue:
+    def __init__(self, path="crawl.db", lease_seconds=120, timeout=30):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        # Autocommit; writes that must be atomic use _immediate()
+        self.conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @contextmanager
+    def _immediate(self):
+        """Write transaction that takes the lock up front (no upgrade deadlocks between workers)"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    # --- PRODUCER ---
+    def configure(self, site, settings):
+        """Record what workers and the merge step need for a site (the latest enqueue wins)"""
+        shared = {k: settings.get(k) for k in SHARED_SETTINGS}
+        self.conn.execute("INSERT OR REPLACE INTO sites (site, settings) VALUES (?, ?)",
+                          (site, json.dumps(shared)))
+
+    def enqueue(self, site, tasks):
+        """Add (query, location, page) tasks; ones already queued (or done) are kept as they are"""
+        with self._immediate() as conn:
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO tasks (site, query, location, page) VALUES (?, ?, ?, ?)",
+                             [(site, q, loc or "", page) for q, loc, page in tasks])
+            return conn.total_changes - before
+
+    # --- WORKERS ---
+    def lease(self, worker, sites=None):
+        """Claim the oldest ready task (reclaiming expired leases first), or None"""
+        now = time.time()
+        site_filter, params = _site_filter(sites)
+        with self._immediate() as conn:
+            conn.execute("UPDATE tasks SET state = 'pending', worker = NULL "
+                         "WHERE state = 'leased' AND lease_expires < ?", (now,))
+            row = conn.execute(f"SELECT id FROM tasks WHERE state = 'pending' AND available_at <= ?{site_filter} "
+                               "ORDER BY id LIMIT 1", (now, *params)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE tasks SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 "
+                         "WHERE id = ?", (worker, now + self.lease_seconds, row["id"]))
+        return self.conn.execute("SELECT * FROM tasks WHERE id = ?", (row["id"],)).fetchone()
+
+    def heartbeat(self, task_id, worker):
+        """Extend a lease; False if it was lost (expired and handed to someone else)"""
+        cur = self.conn.execute("UPDATE tasks SET lease_expires = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                                (time.time() + self.lease_seconds, task_id, worker))
+        return cur.rowcount == 1
+
+    def complete(self, task_id, worker, rows):
+        """Store a task's rows; an empty page also skips the rest of that search"""
+        with self._immediate() as conn:
+            cur = conn.execute("UPDATE tasks SET state = 'done', lease_expires = NULL, error = NULL "
+                               "WHERE id = ? AND worker = ? AND state = 'leased'", (task_id, worker))
+            if cur.rowcount != 1:
+                return False
+            conn.execute("INSERT OR REPLACE INTO results (task_id, site, rows, worker, finished_at) "
+                         "SELECT id, site, ?, ?, ? FROM tasks WHERE id = ?",
+                         (json.dumps(rows, default=str), worker, time.time(), task_id))
+            if not rows:
+                conn.execute("UPDATE tasks SET state = 'skipped' WHERE state = 'pending' AND "
+                             "(site, query, location) = (SELECT site, query, location FROM tasks WHERE id = ?) "
+                             "AND page > (SELECT page FROM tasks WHERE id = ?)", (task_id, task_id))
+        return True
+
+    def retry(self, task_id, worker, error, delay=0.0, max_attempts=3):
+        """Give a task back for a later attempt, or mark it failed once attempts run out"""
+        self.conn.execute(
+            "UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "available_at = ?, worker = NULL, lease_expires = NULL, error = ? "
+            "WHERE id = ? AND worker = ? AND state = 'leased'",
+            (max_attempts, time.time() + delay, error, task_id, worker))
+
+    def reclaim(self, worker):
+        """Release a dead worker's leases right away instead of waiting for them to expire"""
+        cur = self.conn.execute("UPDATE tasks SET state = 'pending', worker = NULL, lease_expires = NULL "
+                                "WHERE state = 'leased' AND worker = ?", (worker,))
+        return cur.rowcount
+
+    # --- STATUS / MERGE ---
+    def unfinished(self, sites=None):
+        site_filter, params = _site_filter(sites)
+        return self.conn.execute(f"SELECT COUNT(*) FROM tasks WHERE state IN ('pending', 'leased'){site_filter}",
+                                 params).fetchone()[0]
+
+    def counts(self):
+        """{site: {state: n}}"""
+        counts = {}
+        for row in self.conn.execute("SELECT site, state, COUNT(*) AS n FROM tasks GROUP BY site, state"):
+            counts.setdefault(row["site"], {})[row["state"]] = row["n"]
+        return counts
+
+    def sites(self):
+        return [row["site"] for row in self.conn.execute("SELECT site FROM sites ORDER BY site")]
+
+    def settings(self, site):
+        row = self.conn.execute("SELECT settings FROM sites WHERE site = ?", (site,)).fetchone()
+        return json.loads(row["settings"]) if row else {}
+
+    def rows(self, site):
+        """All result rows of a site, in task (enqueue) order"""
+        for row in self.conn.execute("SELECT r.rows FROM results r JOIN tasks t ON t.id = r.task_id "
+                                     "WHERE r.site = ? ORDER BY t.id", (site,)):
+            yield from json.loads(row["rows"])
+
+
+def _site_filter(sites):
+    if not sites:
+        return "", ()
+    return f" AND site IN ({','.join('?' * len(sites))})", tuple(sites)
@@ -0,0 +1,200 @@
+"""Multi-process crawl runner over the durable task queue.
+
+    python cli.py monster --plan --headless --queue crawl.db
+    python cli.py indeed -q "python developer" -p 10 --headless --queue crawl.db
+    python crawl_runner.py crawl.db --workers 4           # crawl, then merge outputs
+    python crawl_runner.py crawl.db --workers 4 --no-merge   # another host sharing crawl.db
+    python crawl_runner.py crawl.db --status
+
+Each worker process runs its own Playwright browser, leases page tasks
+from crawl_queue.TaskQueue and heartbeats while a page loads. The runner
+restarts workers that die and hands their leases back at once (leases of
+workers on other hosts simply expire). Once the queue drains, results are
+merged into each site's usual CSV and the SQLite master store.
+"""
+import argparse
+import multiprocessing
+import threading
+import time
+from contextlib import ExitStack
+
+from block_detection import BLOCK_COOLDOWN
+from crawl_queue import TaskQueue, worker_id
+from sites import SITES
+
+LEASE_SECONDS = 120
+ERROR_DELAY = 10        # seconds before a page that failed to load is retried
+MAX_ATTEMPTS = 3
+POLL_SECONDS = 2
+
+
+class Heartbeat(threading.Thread):
+    """Renews a task's lease on its own connection while the worker loads the page"""
+
+    def __init__(self, path, task_id, worker, lease_seconds=LEASE_SECONDS):
+        super().__init__(daemon=True)
+        self.path = path
+        self.task_id = task_id
+        self.worker = worker
+        self.lease_seconds = lease_seconds
+        self.lost = False
+        self._done = threading.Event()
+
+    def run(self):
+        with TaskQueue(self.path, self.lease_seconds) as queue:
+            while not self._done.wait(self.lease_seconds / 3):
+                if not queue.heartbeat(self.task_id, self.worker):
+                    self.lost = True
+                    return
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        return not self.lost
+
+
+def work(path, sites=None, lease_seconds=LEASE_SECONDS):
+    """Worker process: lease, fetch, complete until nothing is left for these sites"""
+    name = worker_id()
+    with TaskQueue(path, lease_seconds) as queue, ExitStack() as stack:
+        sessions = {}
+        cooldowns = {}  # seconds before a blocked page task is retried, doubled per attempt
+        done = 0
+        while True:
+            task = queue.lease(name, sites)
+            if task is None:
+                # Tasks leased elsewhere may still come back (dead worker, retry delay)
+                if not queue.unfinished(sites):
+                    break
+                time.sleep(POLL_SECONDS)
+                continue
+
+            site = task["site"]
+            if site not in sessions:
+                settings = {"base_url": None, "headless": True, "profile": None, "block_cooldown": BLOCK_COOLDOWN,
+                            **queue.settings(site)}
+                sessions[site] = stack.enter_context(SITES[site].session(settings))
+                cooldowns[site] = settings["block_cooldown"]
+            label = f"[{name}] {site} {task['query']!r} @ {task['location'] or '-'} page {task['page']}"
+
+            heartbeat = Heartbeat(path, task["id"], name, lease_seconds)
+            heartbeat.start()
+            error = None
+            try:
+                rows, signal = sessions[site].fetch(task["query"], task["location"], task["page"])
+            except Exception as e:
+                rows, signal, error = None, None, str(e).splitlines()[0]
+            if not heartbeat.stop():
+                print(f"{label}: lease lost, result dropped")
+                continue
+
+            if signal:
+                delay = cooldowns[site] * 2 ** (task["attempts"] - 1)
+                queue.retry(task["id"], name, f"blocked: {signal}", delay, MAX_ATTEMPTS)
+                print(f"{label}: blocked ({signal}), retry in {delay}s")
+            elif rows is None:
+                queue.retry(task["id"], name, error or "page failed to load", ERROR_DELAY, MAX_ATTEMPTS)
+                print(f"{label}: failed ({error or 'page failed to load'})")
+            elif queue.complete(task["id"], name, rows):
+                done += 1
+                print(f"{label}: {len(rows)} jobs" + ("" if rows else " (end of results)"))
+            else:
+                print(f"{label}: lease lost, result dropped")
+        print(f"[{name}] finished {done} page tasks")
+
+
+def run_workers(path, workers, sites=None, lease_seconds=LEASE_SECONDS):
+    """Start worker processes, replace ones that die and return once the queue drains"""
+    ctx = multiprocessing.get_context("spawn")  # fresh interpreter per worker: no shared Playwright state
+
+    def start():
+        proc = ctx.Process(target=work, args=(path, sites, lease_seconds))
+        proc.start()
+        return proc
+
+    procs = [start() for _ in range(workers)]
+    restarts = workers * MAX_ATTEMPTS  # don't respawn forever if e.g. the browser can't launch
+    hostname = worker_id().rsplit(":", 1)[0]
+    with TaskQueue(path, lease_seconds) as queue:
+        try:
+            while procs:
+                time.sleep(POLL_SECONDS)
+                for proc in list(procs):
+                    if proc.is_alive():
+                        continue
+                    procs.remove(proc)
+                    if proc.exitcode != 0:
+                        reclaimed = queue.reclaim(f"{hostname}:{proc.pid}")
+                        print(f"Worker {proc.pid} died (exit {proc.exitcode}); {reclaimed} task(s) reclaimed")
+                        if queue.unfinished(sites) and restarts:
+                            restarts -= 1
+                            procs.append(start())
+        except KeyboardInterrupt:
+            # Leases of the killed workers expire and are picked up by the next run
+            for proc in procs:
+                proc.terminate()
+            raise
+        print_status(queue)
+
+
+def merge(path, sites=None):
+    """Write each site's results to its usual CSV and upsert them into the master store"""
+    from job_store import JobStore, job_key
+
+    with TaskQueue(path) as queue:
+        for name in queue.sites():
+            if sites and name not in sites:
+                continue
+            settings = queue.settings(name)
+            rows, seen = [], set()
+            for row in queue.rows(name):
+                # The same job turns up under several queries
+                key = job_key(name, row)
+                if key and key in seen:
+                    continue
+                seen.add(key)
+                rows.append(row)
+            if not rows:
+                print(f"{name}: no results to merge")
+                continue
+            SITES[name].save(rows, settings.get("output"))
+            if settings.get("store"):
+                with JobStore(settings["store"]) as store:
+                    new = store.upsert(name, rows)
+                print(f"{name}: {len(rows)} jobs merged into {settings['store']} ({len(new)} new)")
+
+
+def print_status(queue):
+    for name, counts in sorted(queue.counts().items()):
+        summary = ", ".join(f"{n} {state}" for state, n in sorted(counts.items()))
+        print(f"{name}: {summary}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run queued page tasks with several worker processes")
+    parser.add_argument("queue", help="SQLite task queue (filled with cli.py <site> --queue DB)")
+    parser.add_argument("-w", "--workers", type=int, default=max(1, (multiprocessing.cpu_count() or 2) // 2),
+                        help="worker processes on this machine, each with its own browser")
+    parser.add_argument("--site", action="append", choices=sorted(SITES), help="only run tasks of this site")
+    parser.add_argument("--lease", type=int, default=LEASE_SECONDS,
+                        help="seconds a task stays leased without a heartbeat")
+    parser.add_argument("--no-merge", action="store_true", help="only crawl; another runner merges")
+    parser.add_argument("--merge", action="store_true", help="only merge finished results into the outputs")
+    parser.add_argument("--status", action="store_true", help="print task counts and exit")
+    args = parser.parse_args(argv)
+
+    if args.status:
+        with TaskQueue(args.queue) as queue:
+            print_status(queue)
+        return 0
+    if not args.merge:
+        started = time.perf_counter()
+        run_workers(args.queue, args.workers, args.site, args.lease)
+        print(f"Crawl finished in {time.perf_counter() - started:.1f}s with {args.workers} worker(s)")
+    if not args.no_merge:
+        merge(args.queue, args.site)
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Page-at-a-time browser sessions for crawl_runner.py workers.
+
+A worker process keeps one session per site: the site's browser (or
+persistent profile) and stealth page, reused across every page task it
+leases. fetch(query, location, page) loads one results page by URL and
+returns (rows, block_signal); rows is None when the page failed to load,
+[] past the last page of results. On a block the session has already
+swapped in a fresh context. The async scrapers run on a private event
+loop, so the worker itself stays a plain synchronous loop.
+"""
+import asyncio
+
+import iims_scraper as iim
+import main as indeed
+import mosnter_scrape as monster
+from browser_profile import close_context, close_context_sync, launch_browser, launch_browser_sync
+from context_recycler import Recycler, RecyclerSync
+
+
+class _AsyncSession:
+    """Drives an async scraper's coroutines on a private event loop"""
+
+    def __enter__(self):
+        self.loop = asyncio.new_event_loop()
+        self.loop.run_until_complete(self.open())
+        return self
+
+    def fetch(self, query, location, page_num):
+        return self.loop.run_until_complete(self.fetch_async(query, location, page_num))
+
+    def __exit__(self, *exc):
+        try:
+            self.loop.run_until_complete(self.close())
+        finally:
+            self.loop.close()
+
+    async def close(self):
+        try:
+            await self.browser.close()
+        finally:
+            await self.playwright.stop()
+
+
+class IndeedSession(_AsyncSession):
+    def __init__(self, base_url=None, headless=True, profile=None):
+        self.base_url = base_url or indeed.BASE_URL
+        self.headless = headless
+        self.profile = profile
+
+    async def open(self):
+        from playwright.async_api import async_playwright
+
+        self.playwright = await async_playwright().start()
+        self.browser = await launch_browser(self.playwright, self.profile, headless=self.headless,
+                                            args=["--disable-blink-features=AutomationControlled"])
+        self.page = await indeed.new_page(self.browser)
+        self.recycler = Recycler(lambda: indeed.new_page(self.browser))
+
+    async def fetch_async(self, query, location, page_num):
+        try:
+            response = await self.page.goto(indeed.page_url(query, location, page_num, self.base_url), timeout=60000)
+        except Exception as e:
+            print(f"  -> Error loading page {page_num}: {e}")
+            return None, None
+        content, signal = await indeed.fetch_page(self.page, response)
+        if signal:
+            await close_context(self.page)
+            self.page = await indeed.new_page(self.browser)
+            return None, signal
+        if content is None:
+            return None, None
+        self.page = await self.recycler.after_navigation(self.page)
+        return indeed.parse_job_cards(content, self.base_url), None
+
+
+class MonsterSession:
+    """Sync API: Monster's scrape_page already loads one page by URL"""
+
+    def __init__(self, base_url=None, headless=True, profile=None):
+        self.base_url = base_url or monster.BASE_URL
+        self.headless = headless
+        self.profile = profile
+
+    def __enter__(self):
+        from playwright.sync_api import sync_playwright
+
+        self.playwright = sync_playwright().start()
+        self.browser = launch_browser_sync(self.playwright, self.profile, headless=self.headless,
+                                           args=["--disable-blink-features=AutomationControlled"])
+        self.page = monster.new_page(self.browser)
+        self.recycler = RecyclerSync(lambda: monster.new_page(self.browser))
+        return self
+
+    def fetch(self, keyword, location, page_num):
+        jobs, signal = monster.scrape_page(self.page, keyword, page_num, location, self.base_url)
+        if signal:
+            close_context_sync(self.page)
+            self.page = monster.new_page(self.browser)
+            return None, signal
+        if jobs:
+            self.page = self.recycler.after_navigation(self.page)
+        return jobs, None
+
+    def __exit__(self, *exc):
+        try:
+            self.browser.close()
+        finally:
+            self.playwright.stop()
+
+
+class IIMJobsSession(_AsyncSession):
+    def __init__(self, base_url=None, headless=True, profile=None):
+        self.scraper = iim.IIMJobsScraper(host=base_url or iim.BASE_URL, headless=headless, profile=profile)
+
+    async def open(self):
+        from playwright.async_api import async_playwright
+
+        self.playwright = await async_playwright().start()
+        self.browser, self.page = await self.scraper.setup_browser(self.playwright)
+        self.recycler = Recycler(lambda: self.scraper.new_page(self.browser))
+
+    async def fetch_async(self, query, location, page_num):
+        self.scraper.base_url = self.scraper.search_url(query, self.scraper.host)
+        items = await self.scraper.collect_page(self.page, page_num)
+        if self.scraper.last_block:
+            await close_context(self.page)
+            self.page = await self.scraper.new_page(self.browser)
+            return None, self.scraper.last_block
+        if items is None:
+            return None, None
+        if items:
+            self.page = await self.recycler.after_navigation(self.page)
+        return iim.parse_cards(items), None
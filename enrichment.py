@@ -0,0 +1,187 @@
+"""Optional detail-page enrichment.
+
+Listing cards only carry a snippet, so this stage visits the detail page of
+each *new* job (keys not yet in the master store) and streams the parsed
+Full_Description / Requirements / Employment_Type fields into the existing
+row dicts. Fetches go through a bounded worker pool with per-domain pacing
+and an on-disk response cache; pages are fetched with Playwright's
+APIRequestContext (no rendering) and parsed off the event loop.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+
+from bs4 import BeautifulSoup
+
+from block_detection import body_signal, status_signal
+from http_pacing import USER_AGENT, DomainPacer
+from job_store import job_key
+
+# Site description containers, used when a page has no JobPosting JSON-LD
+DESCRIPTION_SELECTORS = {
+    "indeed": "#jobDescriptionText",
+    "monster": '[data-testid="svx-description-container"]',
+    "iim": ".job-description, [class*='jobDescription'], [class*='job-description']",
+}
+
+REQUIREMENT_HEADING = re.compile(r"requirement|qualification|skills|must have|what you", re.IGNORECASE)
+
+
+def detail_url(source, row):
+    url = {"indeed": row.get("Link"), "monster": row.get("Apply URL"), "iim": row.get("url")}[source]
+    return url if url and url != "N/A" and str(url).startswith("http") else None
+
+
+# --- PARSING ---
+def _job_posting(soup):
+    """First schema.org JobPosting object in the page's JSON-LD, if any"""
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "")
+        except ValueError:
+            continue
+        items = data if isinstance(data, list) else data.get("@graph", [data])
+        for item in items:
+            if isinstance(item, dict) and item.get("@type") == "JobPosting":
+                return item
+    return None
+
+
+def _requirements(fragment):
+    """List items under a requirements-like heading (all list items if there is no such heading)"""
+    items = []
+    for heading in fragment.find_all(["h2", "h3", "h4", "strong", "b", "p"]):
+        if REQUIREMENT_HEADING.search(heading.get_text()):
+            ul = heading.find_next(["ul", "ol"])
+            if ul:
+                items.extend(li.get_text(" ", strip=True) for li in ul.find_all("li"))
+    if not items:
+        items = [li.get_text(" ", strip=True) for li in fragment.find_all("li")]
+    return [i for i in items if i]
+
+
+def parse_detail(source, html):
+    """Pull the full description fields out of a detail page"""
+    soup = BeautifulSoup(html, "html.parser")
+    posting = _job_posting(soup)
+    employment_type = ""
+    if posting and posting.get("description"):
+        fragment = BeautifulSoup(posting["description"], "html.parser")
+        employment_type = posting.get("employmentType") or ""
+        if isinstance(employment_type, list):
+            employment_type = ", ".join(employment_type)
+    else:
+        fragment = soup.select_one(DESCRIPTION_SELECTORS[source])
+        if fragment is None:
+            return {}
+    return {
+        "Full_Description": fragment.get_text(" ", strip=True),
+        "Requirements": "; ".join(_requirements(fragment)),
+        "Employment_Type": employment_type,
+    }
+
+
+# --- FETCHING ---
+class ResponseCache:
+    """gzip'd response bodies on disk, keyed by URL"""
+
+    def __init__(self, directory=".cache/details", max_age=7 * 24 * 3600):
+        self.directory = directory
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode()).hexdigest() + ".html.gz")
+
+    def get(self, url):
+        path = self._path(url)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                return None
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, url, body):
+        path = self._path(url)
+        with gzip.open(path + ".tmp", "wt", encoding="utf-8") as f:
+            f.write(body)
+        os.replace(path + ".tmp", path)
+
+
+def new_rows(store, source, rows):
+    """Rows whose job key is not in the master store yet"""
+    keyed = [(job_key(source, row), row) for row in rows]
+    known = store.existing_keys(source, {k for k, _ in keyed if k})
+    return [row for k, row in keyed if k and k not in known]
+
+
+async def enrich_rows(source, rows, workers=4, min_interval=1.0, cache=None, timeout=30000, on_row=None):
+    """Fetch and parse the detail page of every row, updating the row dicts in place"""
+    from playwright.async_api import async_playwright
+
+    cache = cache or ResponseCache()
+    pacer = DomainPacer(min_interval)
+    stats = {"rows": len(rows), "fetched": 0, "cached": 0, "enriched": 0, "blocked": 0, "failed": 0}
+    queue = asyncio.Queue()
+    for row in rows:
+        queue.put_nowait(row)
+
+    async def worker(request):
+        while True:
+            try:
+                row = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            url = detail_url(source, row)
+            if not url:
+                continue
+            try:
+                body = cache.get(url)
+                if body is not None:
+                    stats["cached"] += 1
+                else:
+                    await pacer.wait(url)
+                    response = await request.get(url, timeout=timeout)
+                    if status_signal(response):
+                        stats["blocked"] += 1
+                        continue
+                    if not response.ok:
+                        stats["failed"] += 1
+                        continue
+                    body = await response.text()
+                    # Challenge pages often come back as 200; never cache them as the job's page
+                    if body_signal(body, url):
+                        stats["blocked"] += 1
+                        continue
+                    cache.put(url, body)
+                    stats["fetched"] += 1
+
+                fields = await asyncio.to_thread(parse_detail, source, body)
+                if fields:
+                    row.update(fields)
+                    stats["enriched"] += 1
+                    if on_row:
+                        on_row(row)
+            except Exception as e:
+                print(f"    Detail fetch failed for {url}: {e}")
+                stats["failed"] += 1
+
+    started = time.perf_counter()
+    async with async_playwright() as p:
+        request = await p.request.new_context(user_agent=USER_AGENT,
+                                              extra_http_headers={"Accept-Language": "en-US,en;q=0.9"})
+        try:
+            await asyncio.gather(*(worker(request) for _ in range(max(1, workers))))
+        finally:
+            await request.dispose()
+    stats["seconds"] = time.perf_counter() - started
+    print(f"🔎 Enriched {stats['enriched']}/{stats['rows']} {source} jobs "
+          f"({stats['fetched']} fetched, {stats['cached']} cached, {stats['blocked']} blocked, "
+          f"{stats['failed']} failed) in {stats['seconds']:.1f}s")
+    return stats
@@ -0,0 +1,28 @@
+"""Shared pieces of the APIRequestContext fetchers (enrichment.py, planner.py).
+
+Kept free of parsing dependencies so --plan does not need BeautifulSoup.
+"""
+import asyncio
+import time
+from urllib.parse import urlparse
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36")
+
+
+class DomainPacer:
+    """At most one request start per min_interval seconds for each domain"""
+
+    def __init__(self, min_interval=1.0):
+        self.min_interval = min_interval
+        self.locks = {}
+        self.last = {}
+
+    async def wait(self, url):
+        domain = urlparse(url).netloc
+        lock = self.locks.setdefault(domain, asyncio.Lock())
+        async with lock:
+            delay = self.last.get(domain, 0.0) + self.min_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.last[domain] = time.monotonic()
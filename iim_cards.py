@@ -0,0 +1,209 @@
+"""Single-pass parser for IIMJobs card text.
+
+The scraper falls back to a card's inner text when its selectors miss, and
+the saved raw_text repeats the heading, the job URL and a scrape timestamp
+several times. One precompiled scanner walks the text once and splits it
+into structural tokens (experience range, rating/reviews, "Posted ...",
+URLs, timestamps, icon ligatures, line breaks) and the free text between
+them; company/title come from the "Company - Title" gap and the location
+from the gap that follows an experience range.
+
+Light on imports so it also works offline on saved CSVs:
+
+    python iim_cards.py iim_jobs_for_hr.csv -o iim_parsed.csv
+    python iim_cards.py iim_jobs_for_hr.csv --benchmark
+"""
+import argparse
+import csv
+import re
+import time
+from datetime import datetime, timedelta
+
+# The lookahead rejects most positions on one character class before any
+# alternative is tried; that guard is what makes the scan cheap
+TOKEN_PATTERN = re.compile(r"""
+(?=[hPp\dsg.\n])(?:
+    (?P<url>https?://\S+)
+  | (?P<stamp>\d{4}-\d\d-\d\d[ T]\d\d:\d\d(?::\d\d)?)
+  | (?P<exp>(?P<exp_min>\d+)\s*-\s*(?P<exp_max>\d+)\s*yrs?\b)
+  | (?:\b(?P<rating>[0-5](?:\.\d)?)\s+)?(?P<reviews>[\d,]+)\+?\s*Reviews\b
+  | (?i:posted\s+(?P<posted>today|yesterday|just\s+now|(?:\d+\+?|an?)\s+(?:min(?:ute)?|hour|day|week|month|year)s?\s+ago))
+  | (?P<icon>\b(?:premium_icon|star_half|star_border|star|grey)\b)
+  | (?<=\s)(?P<dot>\.)(?=\s)
+  | (?P<nl>\n)
+)""", re.VERBOSE)
+
+HEADING_SEPARATOR = " - "
+
+# Days per unit of a "N <unit>s ago" posted date
+POSTED_DAYS = {"min": 0, "minute": 0, "hour": 0, "day": 1, "week": 7, "month": 30, "year": 365}
+
+FIELDS = ["company", "title", "experience", "experience_min", "experience_max", "location",
+          "rating", "reviews", "posted_relative", "posted_date", "url"]
+
+
+def posted_date(relative, now):
+    """ISO date of 'today' / 'yesterday' / '3 days ago' / 'a week ago' relative to now ('' if unknown)"""
+    relative = " ".join(relative.lower().split())  # "just\nnow", "3  days ago"
+    if relative in ("today", "just now"):
+        days = 0
+    elif relative == "yesterday":
+        days = 1
+    else:
+        words = relative.split()
+        if len(words) < 2:
+            return ""
+        count, unit = words[0].rstrip("+"), POSTED_DAYS.get(words[1].rstrip("s"))
+        if count in ("a", "an"):
+            count = "1"
+        if unit is None or not count.isdigit():
+            return ""
+        days = int(count) * unit
+    return (now - timedelta(days=days)).date().isoformat()
+
+
+def parse_card(text, now=None):
+    """Fields of one card's text in a single scan; also returns the de-junked 'text'"""
+    job = dict.fromkeys(FIELDS, "")
+    job["experience_min"] = job["experience_max"] = job["rating"] = job["reviews"] = None
+    if not text:
+        job["text"] = ""
+        return job
+
+    kept, seen = [], set()      # cleaned text: each gap/token once, no URLs or timestamps
+    after_exp = False           # the next free-text gap is the location
+    # "Company - Title" gap; raw text often also carries the two run together
+    # ("Company Title 8 - 12 yrs"), which has one separator fewer
+    heading, heading_separators = "", 0
+    pos = 0
+    for m in TOKEN_PATTERN.finditer(text):
+        gap = text[pos:m.start()].strip()
+        pos = m.end()
+        if gap:
+            separators = gap.count(HEADING_SEPARATOR)
+            if separators > heading_separators:
+                heading, heading_separators = gap, separators
+            elif after_exp and not job["location"] and not separators:
+                job["location"] = gap
+            after_exp = False
+            if gap not in seen:
+                seen.add(gap)
+                kept.append(gap)
+
+        kind = m.lastgroup
+        if kind in ("nl", "dot"):
+            continue                # separators keep after_exp alive ("8 - 12 yrs . Mumbai")
+        after_exp = kind == "exp"
+        if kind == "exp":
+            if job["experience_min"] is None:
+                job["experience"] = m.group("exp")
+                job["experience_min"], job["experience_max"] = int(m.group("exp_min")), int(m.group("exp_max"))
+        elif kind == "reviews":
+            if job["reviews"] is None:
+                job["reviews"] = int(m.group("reviews").replace(",", ""))
+                if m.group("rating"):
+                    job["rating"] = float(m.group("rating"))
+        elif kind == "posted":
+            job["posted_relative"] = job["posted_relative"] or " ".join(m.group("posted").split())
+        elif kind == "url":
+            job["url"] = job["url"] or m.group("url")
+            continue
+        elif kind == "stamp":
+            now = now or datetime.fromisoformat(m.group("stamp").replace("T", " "))
+            continue
+        elif kind == "icon":
+            continue
+        token = m.group(0).strip()
+        if token not in seen:
+            seen.add(token)
+            kept.append(token)
+
+    gap = text[pos:].strip()
+    if gap:
+        separators = gap.count(HEADING_SEPARATOR)
+        if separators > heading_separators:
+            heading = gap
+        elif after_exp and not job["location"] and not separators:
+            job["location"] = gap
+        if gap not in seen:
+            kept.append(gap)
+
+    if heading:
+        job["company"], _, job["title"] = (part.strip() for part in heading.partition(HEADING_SEPARATOR))
+    elif kept:
+        job["title"] = kept[0]  # confidential posting: no company, the card opens with the title
+
+    if job["posted_relative"]:
+        job["posted_date"] = posted_date(job["posted_relative"], now or datetime.now())
+    job["text"] = " ".join(kept)
+    return job
+
+
+def parse_rows(rows, column="raw_text"):
+    """Offline batch: parse the saved card text of CSV rows"""
+    return [parse_card(row.get(column) or "") for row in rows]
+
+
+# --- BENCHMARK BASELINE ---
+def legacy_parse(all_text):
+    """The previous regex fallback from iims_scraper, kept only as the benchmark baseline"""
+    job_data = {"title": "", "company": "", "experience": "", "location": "", "posted_date": ""}
+    clean_text = all_text.replace('\n', ' ').strip()
+    exp_match = re.search(r'(\d+\s*-\s*\d+\s*yrs)', clean_text)
+    if exp_match:
+        job_data['experience'] = exp_match.group(1)
+    if ' - ' in clean_text:
+        parts = clean_text.split(' - ', 1)
+        job_data['company'] = parts[0].strip()
+        rest = parts[1]
+        cut_indices = []
+        if exp_match: cut_indices.append(rest.find(exp_match.group(1)))
+        if 'premium_icon' in rest: cut_indices.append(rest.find('premium_icon'))
+        cut = min([i for i in cut_indices if i > 0], default=len(rest))
+        job_data['title'] = rest[:cut].strip()
+    if job_data['experience']:
+        loc_match = re.search(r'yrs\s*\.\s*(.*?)\s*Posted', clean_text)
+        if loc_match:
+            job_data['location'] = loc_match.group(1).strip()
+    post_match = re.search(r'Posted\s+(.*?)(?:\s+star|\s+grey|\s+Reviews|$)', clean_text)
+    if post_match:
+        job_data['posted_date'] = post_match.group(1).strip()
+    return job_data
+
+
+def benchmark(texts, repeat=20):
+    for name, parse in (("legacy regex fallback", legacy_parse), ("single-pass parser", parse_card)):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for text in texts:
+                parse(text)
+        elapsed = time.perf_counter() - started
+        per_card = elapsed / (repeat * len(texts)) * 1e6
+        print(f"{name:<22} {per_card:8.1f} µs/card  ({repeat * len(texts) / elapsed:,.0f} cards/s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse saved IIMJobs card text offline")
+    parser.add_argument("csv", help="CSV with a raw card text column (e.g. iim_jobs_for_hr.csv)")
+    parser.add_argument("--column", default="raw_text")
+    parser.add_argument("-o", "--output", help="write the parsed fields to this CSV")
+    parser.add_argument("--benchmark", action="store_true", help="time against the legacy regex fallback")
+    args = parser.parse_args(argv)
+
+    with open(args.csv, encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.DictReader(f))
+    if args.benchmark:
+        benchmark([row.get(args.column) or "" for row in rows])
+
+    jobs = parse_rows(rows, args.column)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS + ["text"])
+            writer.writeheader()
+            writer.writerows(jobs)
+        print(f"Parsed {len(jobs)} cards -> {args.output}")
+    return jobs
+
+
+if __name__ == "__main__":
+    main()
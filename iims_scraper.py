@@ -3,14 +3,68 @@ import csv
 import random
 import pandas as pd
 from datetime import datetime
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
+from playwright.async_api import async_playwright
 import json
+from block_detection import BLOCK_COOLDOWN, Quarantine, detect_block, load_failure
+from browser_profile import close_context, launch_browser
+from context_recycler import Recycler
+from iim_cards import parse_card
+from pipeline import ParsePipeline
+from readiness import scroll_until_stable, wait_for_stable_cards
+
+JOB_CARD_SELECTOR = 'a[href*="/j/"]'
+BASE_URL = "https://www.iimjobs.com"
+
+
+def parse_card_text(job_data, all_text):
+    """Fill missing fields from a card's raw text (runs in a ParsePipeline worker)"""
+    parsed = parse_card(all_text, now=datetime.strptime(job_data['scraped_at'], '%Y-%m-%d %H:%M:%S'))
+    # Selectors win where they found something; the card text fills the gaps
+    for field in ('title', 'company', 'experience', 'location', 'url'):
+        if not job_data.get(field):
+            job_data[field] = parsed[field]
+    if parsed['posted_date']:
+        job_data['posted_date'] = parsed['posted_date']  # ISO date instead of "3 days ago"
+    for field in ('experience_min', 'experience_max', 'rating', 'reviews', 'posted_relative'):
+        job_data[field] = parsed[field]
+
+    # Job Description: the card text without repeated headings, URLs and timestamps
+    job_data['job_description'] = parsed['text'][:500]
+
+    return job_data
+
+
+def parse_cards(items):
+    """Pipeline parse step for one results page: [(job_data, all_text), ...] -> titled jobs"""
+    jobs = []
+    for job_data, all_text in items:
+        job_data = parse_card_text(job_data, all_text)
+        if job_data['title']:  # Only keep if we got a real title
+            jobs.append(job_data)
+    return jobs
+
 
 class IIMJobsScraper:
-    def __init__(self):
-        self.base_url = "https://www.iimjobs.com/search/hr-jobs"
+    def __init__(self, query="hr", host=BASE_URL, headless=False, parse_workers=2, profile=None,
+                 block_cooldown=BLOCK_COOLDOWN):
+        self.host = host
+        self.headless = headless
+        self.profile = profile  # persistent browser profile dir (HTTP cache reused across runs)
+        self.base_url = self.search_url(query, host)
         self.jobs_data = []
+        self.seen = set()
+        self.seen_urls = {}  # search URL -> card URLs already collected, for the end-of-results check
+        self.pipeline = None
+        self.parse_workers = parse_workers
+        self.quarantine = Quarantine(cooldown=block_cooldown)
+        self.last_block = None
         
+    @staticmethod
+    def search_url(query, host=BASE_URL):
+        """Search URL for a category/keyword, e.g. 'hr' -> /search/hr-jobs"""
+        slug = "-".join(query.lower().split())
+        return f"{host}/search/{slug}-jobs"
+    
     async def random_delay(self, min_seconds=1, max_seconds=3):
         """Add random delay to mimic human behavior"""
         await asyncio.sleep(random.uniform(min_seconds, max_seconds))
@@ -54,8 +108,9 @@ class IIMJobsScraper:
     
     async def setup_browser(self, playwright):
         """Setup browser with stealth mode and anti-detection measures"""
-        browser = await playwright.chromium.launch(
-            headless=False,
+        browser = await launch_browser(
+            playwright, self.profile,
+            headless=self.headless,
             args=[
                 '--disable-blink-features=AutomationControlled',
                 '--disable-dev-shm-usage',
@@ -70,6 +125,11 @@ class IIMJobsScraper:
             ]
         )
         
+        page = await self.new_page(browser)
+        return browser, page
+
+    async def new_page(self, browser):
+        """Create a fresh context + stealth page (also used to replace a blocked context)"""
         context = await browser.new_context(
             viewport={'width': 1920, 'height': 1080},
             user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -82,7 +142,7 @@ class IIMJobsScraper:
             is_mobile=False,
         )
         
-        await context.set_extra_http_headers({
+        headers = {
             'Accept-Language': 'en-US,en;q=0.9',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
             'Accept-Encoding': 'gzip, deflate, br',
@@ -93,41 +153,28 @@ class IIMJobsScraper:
             'Sec-Fetch-Mode': 'navigate',
             'Sec-Fetch-Site': 'none',
             'Cache-Control': 'max-age=0',
-        })
+        }
+        if self.profile:
+            # Applies to every request: it would force revalidation of the cached assets
+            del headers['Cache-Control']
+        await context.set_extra_http_headers(headers)
         
         page = await context.new_page()
         await self.apply_stealth(page)
         
-        return browser, page
+        return page
     
-    async def handle_captcha(self, page):
-        """Wait for manual CAPTCHA solving if present"""
-        try:
-            captcha_selectors = [
-                'iframe[src*="captcha"]',
-                'iframe[src*="recaptcha"]',
-                '.g-recaptcha',
-                '#captcha',
-                '[class*="captcha"]',
-                '[id*="captcha"]',
-            ]
-            
-            for selector in captcha_selectors:
-                captcha = await page.query_selector(selector)
-                if captcha:
-                    print("\n" + "="*60)
-                    print("⚠️  CAPTCHA DETECTED!")
-                    print("="*60)
-                    print("Please solve the CAPTCHA manually in the browser window.")
-                    print("Waiting 30 seconds for you to solve it...")
-                    print("="*60 + "\n")
-                    await asyncio.sleep(30)
-                    break
-        except Exception as e:
-            print(f"CAPTCHA check error: {e}")
+    async def check_block(self, page, response=None):
+        """Check all CAPTCHA/block signals at once; no sleeping, the caller quarantines"""
+        signal = await detect_block(page, response)
+        if signal:
+            print("\n" + "="*60)
+            print(f"⚠️  BLOCK DETECTED ({signal})")
+            print("="*60 + "\n")
+        return signal
     
     async def extract_job_details(self, page, job_element):
-        """Extract detailed information from a job listing"""
+        """Read a job listing from the browser. Returns (job_data, all_text) for parse_card_text()."""
         try:
             job_data = {
                 'title': '',
@@ -155,7 +202,7 @@ class IIMJobsScraper:
             if tag_name == 'A':
                 href = await job_element.get_attribute('href')
                 if href and '/j/' in href:
-                    job_data['url'] = href if href.startswith('http') else f"https://www.iimjobs.com{href}"
+                    job_data['url'] = href if href.startswith('http') else f"{self.host}{href}"
 
             # Skip if this is a "Featured Institute" or promotional element
             if 'Featured Institute' in all_text or 'IIT Delhi' in all_text and len(all_text) < 50:
@@ -276,7 +323,7 @@ class IIMJobsScraper:
                 if link_elem:
                     href = await link_elem.get_attribute('href')
                     if href and 'job' in href.lower():
-                        job_data['url'] = href if href.startswith('http') else f"https://www.iimjobs.com{href}"
+                        job_data['url'] = href if href.startswith('http') else f"{self.host}{href}"
                         break
             
             # Education
@@ -297,94 +344,53 @@ class IIMJobsScraper:
             if found_skills:
                 job_data['skills'] = ', '.join(found_skills)
             
-            # Fallback: Parse from full text if selectors failed
-            if not job_data['title'] and all_text:
-                import re
-                # Try to clean text mostly
-                clean_text = all_text.replace('\n', ' ').strip()
-                
-                # Regex for Experience
-                exp_match = re.search(r'(\d+\s*-\s*\d+\s*yrs)', clean_text)
-                if exp_match:
-                    job_data['experience'] = exp_match.group(1)
-                
-                # Deduce Title and Company (assuming "Company - Title ...")
-                # Pattern: "Company - Title ... premium_icon" or just start
-                # Usually text starts with "Company - Title"
-                if ' - ' in clean_text:
-                    parts = clean_text.split(' - ', 1)
-                    if len(parts) >= 2:
-                        job_data['company'] = parts[0].strip()
-                        # Title is part[1] up to some keyword
-                        rest = parts[1]
-                        # Cut off at experience or keywords
-                        cut_indices = []
-                        if exp_match: cut_indices.append(rest.find(exp_match.group(1)))
-                        if 'premium_icon' in rest: cut_indices.append(rest.find('premium_icon'))
-                        
-                        cut = min([i for i in cut_indices if i > 0], default=len(rest))
-                        job_data['title'] = rest[:cut].strip()
-
-                # Location: After experience "yrs . Location Posted"
-                if job_data['experience']:
-                    # find "yrs . "
-                    loc_pattern = r'yrs\s*\.\s*(.*?)\s*Posted'
-                    loc_match = re.search(loc_pattern, clean_text)
-                    if loc_match:
-                        job_data['location'] = loc_match.group(1).strip()
-                
-                # Posted Date
-                post_match = re.search(r'Posted\s+(.*?)(?:\s+star|\s+grey|\s+Reviews|$)', clean_text)
-                if post_match:
-                    job_data['posted_date'] = post_match.group(1).strip()
-
-            # Job Description (get more context)
-            job_data['job_description'] = all_text[:500]  # First 500 chars
-            
-            return job_data
+            # Text fallback + description run later in the parse pipeline (off the event loop)
+            return job_data, all_text
             
         except Exception as e:
             print(f"Error extracting job details: {e}")
             return None
     
-    async def scrape_page(self, page, page_num=1):
-        """Scrape all jobs from current page"""
+    async def collect_page(self, page, page_num=1):
+        """Load a results page and read its cards: [(job_data, all_text), ...], None on error/block,
+        [] when the page has no listings or only repeats cards already collected for this search"""
         print(f"\n📄 Scraping page {page_num}...")
         
         # Construct URL with page parameter
         url = f"{self.base_url}?page={page_num}&loc=&posting=&category=&searchType=&method="
         print(f"🌐 URL: {url}")
         
+        self.last_block = None
+        
         # Navigate to the page
         try:
-            await page.goto(url, wait_until='domcontentloaded', timeout=60000)
+            response = await page.goto(url, wait_until='domcontentloaded', timeout=60000)
         except Exception as e:
             print(f"❌ Error loading page: {e}")
-            return False
-        
-        await self.random_delay(3, 5)
-        
-        # Check for CAPTCHA
-        await self.handle_captcha(page)
-        
-        # Wait for job listings to load
-        try:
-            await page.wait_for_selector('.row, .job-list, [class*="job"], article, .card, .list', timeout=15000)
-        except PlaywrightTimeout:
-            print("⚠️  Timeout waiting for job listings.")
-            return False
+            return None
         
-        await self.random_delay(1, 2)
+        # Check for CAPTCHA / block page
+        self.last_block = await self.check_block(page, response)
+        if self.last_block:
+            return None
         
-        # Scroll to load dynamic content
-        await page.evaluate('window.scrollTo(0, document.body.scrollHeight/2)')
-        await self.random_delay(0.5, 1)
-        await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-        await self.random_delay(1, 2)
+        # Ready as soon as job cards exist and their count has settled (no fixed sleeps)
+        ready = await wait_for_stable_cards(page, JOB_CARD_SELECTOR, min_count=2, timeout=15000, empty_ms=2000)
+        if ready == "empty" or not ready:
+            self.last_block = await self.check_block(page)
+            if self.last_block:
+                return None
+            if ready == "empty":
+                print(f"⚠️  Page {page_num} has no job listings (end of results).")
+                return []
+            print("⚠️  No /j/ job cards yet, trying fallback selectors.")
+        else:
+            # Infinite scroll: stop as soon as the card count stops changing
+            await scroll_until_stable(page, JOB_CARD_SELECTOR)
         
         # Find all job cards/listings
         job_selectors = [
-            'a[href*="/j/"]',  # Direct job links
+            JOB_CARD_SELECTOR,  # Direct job links
             '.job-list a',     # Links inside job-list
             'article',
             '.job-card',
@@ -418,38 +424,53 @@ class IIMJobsScraper:
                 f.write(content)
             await page.screenshot(path=f'debug_page_{page_num}.png', full_page=True)
             print(f"💾 Debug files saved: debug_page_{page_num}.html and debug_page_{page_num}.png")
-            return False
+            return []
         
-        # Extract data from each job listing
-        jobs_found = 0
+        # Read each listing's raw data from the browser; parsing is queued for the pipeline
+        items = []
         for idx, job_elem in enumerate(job_elements, 1):
             try:
-                job_data = await self.extract_job_details(page, job_elem)
-                if job_data and job_data['title']:  # Only add if we got a real title
-                    # Check for duplicates
-                    is_duplicate = False
-                    for existing_job in self.jobs_data:
-                        if (existing_job['title'] == job_data['title'] and 
-                            existing_job['company'] == job_data['company']):
-                            is_duplicate = True
-                            break
-                    
-                    if not is_duplicate:
-                        self.jobs_data.append(job_data)
-                        jobs_found += 1
-                        print(f"  ✓ Job {jobs_found}: {job_data['title'][:60]}...")
-                        if job_data['company']:
-                            print(f"      Company: {job_data['company']}")
-                        if job_data['location']:
-                            print(f"      Location: {job_data['location']}")
-                
-                await self.random_delay(0.2, 0.5)
+                item = await self.extract_job_details(page, job_elem)
+                if item:
+                    items.append(item)
             except Exception as e:
                 print(f"  ✗ Error processing element {idx}: {e}")
                 continue
         
-        print(f"\n✅ Successfully extracted {jobs_found} unique jobs from page {page_num}")
-        return jobs_found > 0
+        # Past the last page the results repeat; stop like the old "no new unique jobs" check
+        urls = {job_data['url'] for job_data, _ in items if job_data['url']}
+        seen = self.seen_urls.setdefault(self.base_url, set())
+        if urls and urls <= seen:
+            print(f"⚠️  Page {page_num} only repeats jobs already seen.")
+            return []
+        seen.update(urls)
+        return items
+
+    async def scrape_page(self, page, page_num=1):
+        """Scrape all jobs from current page"""
+        items = await self.collect_page(page, page_num)
+        if not items:
+            return False
+        await self.pipeline.put(items)
+        print(f"\n✅ Queued {len(items)} job cards from page {page_num} (parse queue depth {self.pipeline.depth})")
+        return True
+    
+    def add_jobs(self, jobs):
+        """Pipeline callback: keep parsed jobs that are not duplicates (in page order)"""
+        jobs_found = 0
+        for job_data in jobs:
+            key = (job_data['title'], job_data['company'])
+            if key in self.seen:
+                continue
+            self.seen.add(key)
+            self.jobs_data.append(job_data)
+            jobs_found += 1
+            print(f"  ✓ Job {len(self.jobs_data)}: {job_data['title'][:60]}...")
+            if job_data['company']:
+                print(f"      Company: {job_data['company']}")
+            if job_data['location']:
+                print(f"      Location: {job_data['location']}")
+        print(f"📊 Added {jobs_found} unique jobs, total {len(self.jobs_data)}")
     
     async def save_to_csv(self, filename='iimjobs_hr_jobs.csv'):
         """Save scraped data to CSV file using Pandas for better organization"""
@@ -485,37 +506,99 @@ class IIMJobsScraper:
         
         return filename
     
-    async def scrape(self, max_pages=10):
-        """Main scraping function"""
+    async def quarantine_page(self, browser, page, page_num, signal=None):
+        """Park a blocked page for later and carry on with a fresh context"""
+        # Keyed by search URL too: one scraper runs several queries (see sites.IIMJobsSite)
+        if self.quarantine.add((self.base_url, page_num), signal or self.last_block):
+            print(f"🚧 Page {page_num} quarantined for retry ({self.quarantine.summary()})")
+        else:
+            print(f"🚫 Page {page_num} still blocked after {self.quarantine.max_attempts} attempts. Dropping it.")
+        await close_context(page)
+        return await self.new_page(browser)
+    
+    async def retry_due(self, browser, page):
+        """Re-run quarantined pages whose cooldown has expired; ones that fail again go back in"""
+        search_url = self.base_url
+        for base_url, page_num in self.quarantine.due():
+            print(f"🔁 Retrying quarantined page {page_num} of {base_url}")
+            self.base_url = base_url
+            items = await self.collect_page(page, page_num)
+            if items is None:
+                page = await self.quarantine_page(browser, page, page_num, self.last_block or load_failure(base_url))
+            elif items:
+                await self.pipeline.put(items)
+        self.base_url = search_url
+        return page
+    
+    async def retry_quarantined(self, browser, page):
+        """Drain the quarantine after the last search; the only place the crawl waits for a cooldown"""
+        while len(self.quarantine):
+            wait = self.quarantine.next_retry_in()
+            if wait:
+                print(f"⏳ {len(self.quarantine)} quarantined page(s), next retry in {wait:.0f}s")
+                await asyncio.sleep(wait)
+            page = await self.retry_due(browser, page)
+        if self.quarantine.dropped:
+            print(f"⚠️  Quarantine: {self.quarantine.summary()}")
+        return page
+    
+    async def scrape_search(self, browser, page, recycler, max_pages):
+        """Crawl self.base_url's pages; blocked ones go to the quarantine. Returns the current page."""
+        for page_num in range(1, max_pages + 1):
+            success = await self.scrape_page(page, page_num)
+            
+            if self.last_block:
+                page = await self.quarantine_page(browser, page, page_num)
+                continue
+            
+            if not success:
+                print(f"⚠️  No jobs found on page {page_num}. Stopping here.")
+                break
+            
+            # Swap in a fresh context once memory / latency watermarks are crossed
+            page = await recycler.after_navigation(page)
+            
+            # Small delay between pages
+            if page_num < max_pages:
+                await self.random_delay(2, 4)
+        return page
+    
+    async def scrape(self, max_pages=10, output_file='iimjobs_hr_jobs.csv', queries=None):
+        """Main scraping function; queries: optional (query, max_pages) list crawled with one browser"""
+        if queries is None:
+            searches = [(self.base_url, max_pages)]
+        else:
+            searches = [(self.search_url(q, self.host), pages) for q, pages in queries]
         async with async_playwright() as playwright:
             browser = None
             try:
                 browser, page = await self.setup_browser(playwright)
+                recycler = Recycler(lambda: self.new_page(browser))
+                self.pipeline = await ParsePipeline(parse_cards, self.add_jobs, workers=self.parse_workers,
+                                                    label="iim").start()
                 
                 print("="*60)
                 print("🚀 IIMJobs HR Position Scraper")
                 print("="*60)
-                print(f"🌐 Base URL: {self.base_url}")
-                print(f"📄 Max pages to scrape: {max_pages}")
+                for search_url, pages in searches:
+                    print(f"🌐 {search_url} (max {pages} pages)")
                 print("="*60 + "\n")
                 
-                # Scrape pages 1 through max_pages
-                for page_num in range(1, max_pages + 1):
-                    success = await self.scrape_page(page, page_num)
-                    
-                    if not success:
-                        print(f"⚠️  No jobs found on page {page_num}. Stopping here.")
-                        break
-                    
-                    print(f"📊 Total unique jobs collected: {len(self.jobs_data)}")
-                    
-                    # Small delay between pages
-                    if page_num < max_pages:
-                        await self.random_delay(2, 4)
+                for search_url, pages in searches:
+                    self.base_url = search_url
+                    page = await self.scrape_search(browser, page, recycler, pages)
+                    # Blocked pages whose cooldown is over are retried between searches
+                    page = await self.retry_due(browser, page)
+                
+                # Retry the rest of the blocked pages once their cooldown has passed
+                page = await self.retry_quarantined(browser, page)
+                
+                # Wait for the parsers to catch up
+                await self.pipeline.finish()
                 
                 # Save results
                 if self.jobs_data:
-                    csv_path = await self.save_to_csv()
+                    csv_path = await self.save_to_csv(output_file)
                     
                     print("\n" + "="*60)
                     print("🎉 SCRAPING COMPLETED!")
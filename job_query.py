@@ -0,0 +1,245 @@
+"""In-process indexed queries over collected jobs.
+
+    index = JobIndex.from_store(JobStore("jobs.db"))
+    index.query(text="python", mentions=["aws"], remote=True,
+                min_salary=100000, since_days=7)
+
+Rows from all three sources are normalised once into inverted indexes
+(skills, company, location, keyword, title/summary tokens) plus sorted
+date and annual-salary indexes. A query intersects the smallest posting
+sets first and only range-scans when no inverted filter applies, so it
+touches the matching rows rather than the whole corpus.
+"""
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+TAG_PATTERN = re.compile(r"<[^<]+?>")
+# "(YEARLY)" from Indeed's structured salary, "a year" / "/ month" / "hourly" in display text
+SALARY_PERIOD_PATTERN = re.compile(r"\b(hour|daily|day|week|month|year|annum|annual)", re.IGNORECASE)
+# "$60,000", "90k", "15 LPA", "1.2 Cr"
+SALARY_AMOUNT_PATTERN = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*(k|lakhs?|lacs?|lpa|crores?|cr)?\b", re.IGNORECASE)
+
+# Multipliers to an annual figure
+SALARY_PERIODS = {"hour": 2080, "daily": 260, "day": 260, "week": 52, "month": 12,
+                  "year": 1, "annum": 1, "annual": 1}
+SALARY_UNITS = {"k": 1e3, "lakh": 1e5, "lac": 1e5, "lpa": 1e5, "crore": 1e7, "cr": 1e7}
+
+MISSING_DATE = -1
+
+
+def tokenize(text):
+    """Lower-case word tokens that keep tech names intact (c#, c++, node.js)"""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def _text(value):
+    if value is None or value != value or value == "N/A":  # value != value catches NaN
+        return ""
+    return str(value).strip()
+
+
+def _float(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return math.nan
+    return number
+
+
+def salary_from_text(text):
+    """Highest amount in display salary text ('$60,000 - $90,000 / year', '10 - 15 LPA'), NaN if none"""
+    amounts = [float(number.replace(",", "")) * SALARY_UNITS.get(unit.lower().rstrip("s"), 1)
+               for number, unit in SALARY_AMOUNT_PATTERN.findall(text)]
+    return max(amounts) if amounts else math.nan
+
+
+def _date_ordinal(value):
+    value = _text(value)
+    if not value:
+        return MISSING_DATE
+    try:
+        return datetime.fromisoformat(value[:10]).toordinal()
+    except ValueError:
+        return MISSING_DATE
+
+
+def normalize(row):
+    """Map an Indeed / Monster / IIM row (CSV or store) onto one flat shape"""
+    g = row.get
+    salary_text = _text(g("Salary_Text") or g("Salary") or g("salary"))
+    salary = _float(g("Salary_Max"))
+    if math.isnan(salary):
+        salary = _float(g("Salary_Min"))
+    if math.isnan(salary):
+        # Monster, IIM and Indeed's salary snippets only carry display text
+        salary = salary_from_text(salary_text)
+    if not math.isnan(salary):
+        period = SALARY_PERIOD_PATTERN.search(salary_text)
+        salary *= SALARY_PERIODS[period.group(1).lower()] if period else 1
+
+    skills = _text(g("Skills_Detected") or g("Skills") or g("skills"))
+    location = _text(g("Location") or g("location"))
+    remote = _text(g("Is_Remote")).lower() == "true" or "remote" in location.lower()
+
+    return {
+        "title": _text(g("Title") or g("title")),
+        "company": _text(g("Company") or g("company")),
+        "location": location,
+        "keyword": _text(g("Keyword")),
+        "summary": TAG_PATTERN.sub("", _text(g("Summary") or g("job_description"))),
+        "skills": [s.strip().lower() for s in skills.split(",") if s.strip()],
+        "date": _date_ordinal(g("Date_Posted") or g("Date Posted") or g("posted_date")),
+        "salary": salary,
+        "remote": remote,
+    }
+
+
+class JobIndex:
+    def __init__(self):
+        self.rows = []
+        self.skills = defaultdict(set)
+        self.company = defaultdict(set)
+        self.location = defaultdict(set)
+        self.keyword = defaultdict(set)
+        self.tokens = defaultdict(set)      # title + summary
+        self.remote = set()
+        self.dates = array("l")             # per row, MISSING_DATE when unknown
+        self.salaries = array("d")          # per row, annualised, NaN when unknown
+        self._by_date = None
+        self._by_salary = None
+
+    @classmethod
+    def from_rows(cls, rows):
+        index = cls()
+        for row in rows:
+            index.add(row)
+        # Build the sorted indexes up front so the first range query is fast too
+        index._sorted_dates()
+        index._sorted_salaries()
+        return index
+
+    @classmethod
+    def from_store(cls, store, source=None, since=None):
+        return cls.from_rows(store.iter_jobs(source, since))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, row):
+        doc = len(self.rows)
+        n = normalize(row)
+        self.rows.append(row)
+
+        for skill in n["skills"]:
+            self.skills[skill].add(doc)
+        if n["company"]:
+            self.company[n["company"].lower()].add(doc)
+        if n["keyword"]:
+            self.keyword[n["keyword"].lower()].add(doc)
+        for token in tokenize(n["location"]):
+            self.location[token].add(doc)
+        for token in set(tokenize(n["title"])) | set(tokenize(n["summary"])):
+            self.tokens[token].add(doc)
+        if n["remote"]:
+            self.remote.add(doc)
+
+        self.dates.append(n["date"])
+        self.salaries.append(n["salary"])
+        self._by_date = self._by_salary = None  # sorted indexes rebuilt lazily
+        return doc
+
+    # --- SORTED INDEXES ---
+    def _sorted_dates(self):
+        if self._by_date is None:
+            docs = sorted((d for d in range(len(self.rows)) if self.dates[d] != MISSING_DATE),
+                          key=self.dates.__getitem__)
+            self._by_date = (array("l", (self.dates[d] for d in docs)), array("l", docs))
+        return self._by_date
+
+    def _sorted_salaries(self):
+        if self._by_salary is None:
+            docs = sorted((d for d in range(len(self.rows)) if not math.isnan(self.salaries[d])),
+                          key=self.salaries.__getitem__)
+            self._by_salary = (array("d", (self.salaries[d] for d in docs)), array("l", docs))
+        return self._by_salary
+
+    @staticmethod
+    def _range(sorted_index, low, high):
+        keys, docs = sorted_index
+        lo = 0 if low is None else bisect_left(keys, low)
+        hi = len(keys) if high is None else bisect_right(keys, high)
+        return docs[lo:hi]
+
+    # --- QUERY ---
+    def query(self, text=None, skills=None, mentions=None, company=None, location=None,
+              keyword=None, remote=None, min_salary=None, max_salary=None,
+              since=None, until=None, since_days=None, limit=None):
+        """Return matching rows, newest first.
+
+        text       every token must appear in the title or summary
+        skills     every skill must be in the detected-skills list
+        mentions   every term must be a skill OR a title/summary token
+        company / location / keyword   exact company, location tokens, search keyword
+        min_salary / max_salary        annualised salary bounds
+        since / until / since_days     posting date bounds (date or 'YYYY-MM-DD')
+        """
+        sets = []
+        for token in tokenize(text):
+            sets.append(self.tokens.get(token, set()))
+        for skill in skills or []:
+            sets.append(self.skills.get(skill.strip().lower(), set()))
+        for term in mentions or []:
+            term = term.strip().lower()
+            sets.append(self.skills.get(term, set()) | self.tokens.get(term, set()))
+        if company:
+            sets.append(self.company.get(company.strip().lower(), set()))
+        for token in tokenize(location):
+            sets.append(self.location.get(token, set()))
+        if keyword:
+            sets.append(self.keyword.get(keyword.strip().lower(), set()))
+        if remote:
+            sets.append(self.remote)
+
+        low_date = _date_ordinal(str(since)) if since else None
+        if since_days is not None:
+            low_date = max(low_date or 0, (date.today() - timedelta(days=since_days)).toordinal())
+        high_date = _date_ordinal(str(until)) if until else None
+        date_filter = low_date is not None or high_date is not None
+        salary_filter = min_salary is not None or max_salary is not None
+
+        if sets:
+            sets.sort(key=len)
+            candidates = set(sets[0])
+            for s in sets[1:]:
+                if not candidates:
+                    break
+                candidates &= s
+        elif date_filter:
+            candidates = set(self._range(self._sorted_dates(), low_date, high_date))
+            date_filter = False
+        elif salary_filter:
+            candidates = set(self._range(self._sorted_salaries(), min_salary, max_salary))
+            salary_filter = False
+        else:
+            candidates = set(range(len(self.rows)))
+
+        if date_filter:
+            lo = MISSING_DATE + 1 if low_date is None else low_date
+            hi = math.inf if high_date is None else high_date
+            candidates = {d for d in candidates if lo <= self.dates[d] <= hi}
+        if salary_filter:
+            lo = -math.inf if min_salary is None else min_salary
+            hi = math.inf if max_salary is None else max_salary
+            candidates = {d for d in candidates if lo <= self.salaries[d] <= hi}
+
+        if limit is not None:
+            docs = heapq.nlargest(limit, candidates, key=self.dates.__getitem__)
+        else:
+            docs = sorted(candidates, key=self.dates.__getitem__, reverse=True)
+        return [self.rows[d] for d in docs]
@@ -0,0 +1,167 @@
+"""SQLite master job store.
+
+Every scrape is upserted into one indexed table keyed by (source, job_key)
+with first_seen / last_seen tracking, so adding a run only touches that
+run's rows instead of re-reading every CSV snapshot.
+"""
+import csv
+import json
+import re
+import sqlite3
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    source      TEXT NOT NULL,
+    job_key     TEXT NOT NULL,
+    first_seen  TEXT NOT NULL,
+    last_seen   TEXT NOT NULL,
+    seen_count  INTEGER NOT NULL DEFAULT 1,
+    data        TEXT NOT NULL,
+    PRIMARY KEY (source, job_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs (source, last_seen);
+"""
+
+# data is merged, not replaced: fields only some runs fetch (the detail-page
+# Full_Description etc. from --enrich) survive later listing-only runs. None
+# values are left out of data (see _data), so a field a run did not fill keeps
+# its last known value and every stored row has the same shape
+UPSERT_SQL = """
+INSERT INTO jobs (source, job_key, first_seen, last_seen, seen_count, data)
+VALUES (?, ?, ?, ?, 1, ?)
+ON CONFLICT (source, job_key) DO UPDATE SET
+    last_seen = excluded.last_seen,
+    seen_count = jobs.seen_count + 1,
+    data = json_patch(jobs.data, excluded.data)
+"""
+
+IIM_ID_PATTERN = re.compile(r'/j/[^?#]*?-(\d+)(?:[?#/]|$)')
+
+
+def _clean(value):
+    if value is None or value == "N/A" or value != value:  # value != value catches NaN
+        return None
+    return str(value).strip() or None
+
+
+def _data(row):
+    """Row as stored JSON; None fields are dropped (json_patch would delete them, RFC 7396)"""
+    return json.dumps({k: v for k, v in row.items() if v is not None}, default=str)
+
+
+def _url_key(url):
+    """Job URL without tracking parameters"""
+    url = _clean(url)
+    return url.split("?", 1)[0].split("#", 1)[0] if url else None
+
+
+def indeed_key(row):
+    return _clean(row.get("Job_Key")) or _url_key(row.get("Link"))
+
+
+def monster_key(row):
+    return _clean(row.get("Job ID")) or _url_key(row.get("Apply URL"))
+
+
+def iim_key(row):
+    url = _clean(row.get("url"))
+    if url:
+        match = IIM_ID_PATTERN.search(url)
+        if match:
+            return match.group(1)
+        return _url_key(url)
+    # No link captured: fall back to the title+company pair the scraper de-dupes on
+    title, company = _clean(row.get("title")), _clean(row.get("company"))
+    return f"{company}|{title}" if title else None
+
+
+KEY_FUNCS = {
+    "indeed": indeed_key,
+    "monster": monster_key,
+    "iim": iim_key,
+}
+
+
+def job_key(source, row):
+    """Stable per-source key for a scraped row (None if the row has no identity)"""
+    return KEY_FUNCS[source](row)
+
+
+class JobStore:
+    def __init__(self, path="jobs.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def existing_keys(self, source, keys):
+        """Subset of keys already stored for source (looked up through the primary key)"""
+        found = set()
+        keys = list(keys)
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT job_key FROM jobs WHERE source = ? AND job_key IN ({marks})", [source, *chunk])
+            found.update(r[0] for r in rows)
+        return found
+
+    def upsert(self, source, rows, seen_at=None, batch_size=500):
+        """Upsert one run's rows in batched transactions; returns the set of newly seen keys"""
+        seen_at = seen_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        batch = {}
+        for row in rows:
+            key = job_key(source, row)
+            if key:
+                batch[key] = row  # last occurrence in a run wins
+
+        new_keys = set()
+        items = list(batch.items())
+        for i in range(0, len(items), batch_size):
+            chunk = items[i:i + batch_size]
+            known = self.existing_keys(source, (k for k, _ in chunk))
+            new_keys.update(k for k, _ in chunk if k not in known)
+            with self.conn:
+                self.conn.executemany(UPSERT_SQL, [
+                    (source, key, seen_at, seen_at, _data(row))
+                    for key, row in chunk
+                ])
+
+        print(f"💾 Store: {len(new_keys)} new, {len(items) - len(new_keys)} updated "
+              f"{source} jobs in {self.path}")
+        return new_keys
+
+    def iter_jobs(self, source=None, since=None):
+        """Yield stored rows (with source/job_key/first_seen/last_seen added)"""
+        sql = "SELECT source, job_key, first_seen, last_seen, seen_count, data FROM jobs"
+        clauses, params = [], []
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        if since:
+            clauses.append("last_seen >= ?")
+            params.append(since)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        for src, key, first_seen, last_seen, seen_count, data in self.conn.execute(sql, params):
+            row = json.loads(data)
+            row.update(source=src, job_key=key, first_seen=first_seen,
+                       last_seen=last_seen, seen_count=seen_count)
+            yield row
+
+
+def import_csv(store, source, path):
+    """Upsert an existing CSV snapshot (e.g. indeed_jobs_YYYYMMDD_HHMM.csv) into the store"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return store.upsert(source, csv.DictReader(f))
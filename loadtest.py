@@ -0,0 +1,136 @@
+"""End-to-end load test: run the real scrapers against mock_server.py.
+
+    python loadtest.py --sites indeed iim -q "python developer" --pages 5 --latency 20 80
+    python loadtest.py --sites monster --captcha-rate 0.1 --failure-rate 0.05
+
+For each site it reports pages/s (result pages the mock actually served),
+jobs/s (rows returned by the scraper) and peak RSS of this process plus its
+children (Playwright driver and Chromium).
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from mock_server import MockJobBoard, add_config_arguments, config_from_args
+from sites import SITES
+
+
+class MemorySampler(threading.Thread):
+    """Polls /proc for the summed RSS of this process tree and keeps the peak"""
+
+    def __init__(self, interval=0.1):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = 0
+        self._done = threading.Event()
+
+    @staticmethod
+    def tree_rss(root=None):
+        root = root or os.getpid()
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        children, rss = {}, {}
+        for pid in os.listdir("/proc"):
+            if not pid.isdigit():
+                continue
+            try:
+                with open(f"/proc/{pid}/stat") as f:
+                    fields = f.read().rsplit(")", 1)[1].split()
+            except OSError:
+                continue
+            children.setdefault(int(fields[1]), []).append(int(pid))  # fields[1] = ppid
+            rss[int(pid)] = int(fields[21]) * page_size                # fields[21] = rss pages
+        total, stack = 0, [root]
+        while stack:
+            pid = stack.pop()
+            total += rss.get(pid, 0)
+            stack.extend(children.get(pid, []))
+        return total
+
+    def run(self):
+        while not self._done.is_set():
+            self.peak = max(self.peak, self.tree_rss())
+            self._done.wait(self.interval)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        return self.peak
+
+
+def peak_rss():
+    """Fallback when /proc is unavailable: max RSS of self + reaped children"""
+    import resource
+    kb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+          + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return kb * 1024
+
+
+def run_site(board, name, queries, location, pages, out_dir, block_cooldown):
+    site = SITES[name]
+    settings = {
+        "queries": queries or site.default_queries[:2],
+        "locations": [location],
+        "pages": pages,
+        "output": os.path.join(out_dir, f"{name}_loadtest.csv"),
+        "base_url": board.url,
+        "headless": True,
+        "parse_workers": 2,
+        "profile": None,
+        "block_cooldown": block_cooldown,
+        "store": None,
+    }
+    pages_before = board.stats.pages[name]
+    sampler = MemorySampler() if os.path.isdir("/proc") else None
+    if sampler:
+        sampler.start()
+
+    started = time.perf_counter()
+    rows = site.run(settings) or []
+    elapsed = time.perf_counter() - started
+
+    peak = sampler.stop() if sampler else peak_rss()
+    served = board.stats.pages[name] - pages_before
+    return {
+        "site": name,
+        "seconds": elapsed,
+        "pages": served,
+        "jobs": len(rows),
+        "pages_per_sec": served / elapsed if elapsed else 0.0,
+        "jobs_per_sec": len(rows) / elapsed if elapsed else 0.0,
+        "peak_mb": peak / (1024 * 1024),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the scrapers against the local mock job board")
+    parser.add_argument("--sites", nargs="+", choices=sorted(SITES), default=sorted(SITES))
+    parser.add_argument("-q", "--query", action="append", help="query to scrape (repeatable)")
+    parser.add_argument("-l", "--location", default="Remote")
+    parser.add_argument("--block-cooldown", type=float, default=0.5,
+                        help="seconds before a blocked page is retried; the scrapers' 60s would swamp pages/s")
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    config = config_from_args(args)
+    results = []
+    with MockJobBoard(config) as board, tempfile.TemporaryDirectory() as out_dir:
+        print(f"Mock job board on {board.url}")
+        for name in args.sites:
+            print(f"\n=== {name} ===")
+            results.append(run_site(board, name, args.query, args.location, args.pages, out_dir,
+                                    args.block_cooldown))
+        failures, captchas = board.stats.failures, board.stats.captchas
+
+    print("\n" + "=" * 72)
+    print(f"{'site':<10}{'time s':>9}{'pages':>8}{'jobs':>8}{'pages/s':>10}{'jobs/s':>10}{'peak MB':>10}")
+    for r in results:
+        print(f"{r['site']:<10}{r['seconds']:>9.1f}{r['pages']:>8}{r['jobs']:>8}"
+              f"{r['pages_per_sec']:>10.2f}{r['jobs_per_sec']:>10.1f}{r['peak_mb']:>10.0f}")
+    print(f"Injected: {failures} failures, {captchas} captchas")
+    return results
+
+
+if __name__ == "__main__":
+    main()
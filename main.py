@@ -1,190 +1,306 @@
 import asyncio
 import json
 import re
+from functools import partial
 import pandas as pd
-import random
 from datetime import datetime
 from playwright.async_api import async_playwright
+from block_detection import BLOCK_COOLDOWN, Quarantine, detect_block, load_failure
+from browser_profile import close_context, launch_browser
+from context_recycler import Recycler
+from pipeline import ParsePipeline
+from readiness import wait_for_mosaic
 
-async def scrape_indeed_rich_data(job_search, location, max_pages=15):
-    all_jobs = []
-    
-    async with async_playwright() as p:
-        # Launch browser
-        browser = await p.chromium.launch(
-            headless=False, 
-            args=["--disable-blink-features=AutomationControlled", "--start-maximized"]
-        )
-        
-        # Create browser context
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-            viewport={"width": 1920, "height": 1080}
-        )
-        
-        page = await context.new_page()
+# Regex to find the JS variable containing the JSON data
+MOSAIC_PATTERN = re.compile(r'window.mosaic.providerData\["mosaic-provider-jobcards"\]\s*=\s*({.*?});', re.DOTALL)
 
-        # Inject stealth script
-        await page.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined});")
+BASE_URL = "https://www.indeed.com"
 
-        # Initial navigation
-        url = f"https://www.indeed.com/jobs?q={job_search}&l={location}"
-        print(f"Navigating to: {url}")
-        
-        try:
-            await page.goto(url, timeout=60000)
-        except:
-            print("Page load timeout - reloading...")
-            await page.reload()
+STEALTH_JS = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined});"
 
-        for current_page in range(1, max_pages + 1):
-            print(f"\n--- Processing Page {current_page} of {max_pages} ---")
-            
-            # Wait for job cards to load
-            try:
-                # Wait for the main feed container
-                await page.wait_for_selector('#mosaic-provider-jobcards', timeout=15000)
-            except:
-                print("  -> Jobs didn't load. Possible captcha or network issue.")
-                # Optional: await page.pause() to manually solve captcha
-                break
+def page_url(job_search, location, page_num, base_url=BASE_URL):
+    """Direct URL of a results page (Indeed pages in steps of 10)"""
+    url = f"{base_url}/jobs?q={job_search}&l={location}"
+    if page_num > 1:
+        url += f"&start={(page_num - 1) * 10}"
+    return url
 
-            # Random delay
-            await page.wait_for_timeout(random.randint(2000, 4000))
+async def new_page(browser):
+    """Create a fresh browser context + page (also used to replace a blocked one)"""
+    context = await browser.new_context(
+        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+        viewport={"width": 1920, "height": 1080}
+    )
+    
+    page = await context.new_page()
 
-            # Extract JSON data
-            content = await page.content()
-            
-            # Regex to find the JS variable containing the JSON data
-            pattern = re.compile(r'window.mosaic.providerData\["mosaic-provider-jobcards"\]\s*=\s*({.*?});', re.DOTALL)
-            match = pattern.search(content)
+    # Inject stealth script
+    await page.add_init_script(STEALTH_JS)
+    return page
+
+def parse_job_cards(content, base_url=BASE_URL):
+    """Turn the mosaic job-cards JSON embedded in a results page into rows"""
+    jobs = []
+    match = MOSAIC_PATTERN.search(content)
+    
+    if match:
+        try:
+            json_data = json.loads(match.group(1))
+            results = json_data.get('metaData', {}).get('mosaicProviderJobCardsModel', {}).get('results', [])
+            print(f"  -> Found {len(results)} jobs in JSON.")
             
-            if match:
+            for job in results:
                 try:
-                    json_data = json.loads(match.group(1))
-                    results = json_data.get('metaData', {}).get('mosaicProviderJobCardsModel', {}).get('results', [])
-                    print(f"  -> Found {len(results)} jobs in JSON.")
+                    # --- A. IDS & LINKS ---
+                    jk = job.get('jobkey')
+                    link = f"{base_url}/viewjob?jk={jk}" if jk else "N/A"
+
+                    # --- B. SALARY (Structured + Fallback) ---
+                    # Try to get the clean numbers first
+                    salary_obj = job.get('extractedSalary')
+                    salary_text = "N/A"
+                    salary_min = None
+                    salary_max = None
                     
-                    for job in results:
-                        try:
-                            # --- A. IDS & LINKS ---
-                            jk = job.get('jobkey')
-                            link = f"https://www.indeed.com/viewjob?jk={jk}" if jk else "N/A"
-
-                            # --- B. SALARY (Structured + Fallback) ---
-                            # Try to get the clean numbers first
-                            salary_obj = job.get('extractedSalary')
-                            salary_text = "N/A"
-                            salary_min = None
-                            salary_max = None
-                            
-                            if salary_obj:
-                                salary_min = salary_obj.get('min')
-                                salary_max = salary_obj.get('max')
-                                s_type = salary_obj.get('type', '')
-                                salary_text = f"{salary_min} - {salary_max} ({s_type})"
-                            
-                            # Fallback to the snippet text if structured data is missing
-                            if salary_text == "N/A":
-                                salary_text = job.get('salarySnippet', {}).get('text', 'N/A')
-
-                            # --- C. DATES (Timestamp Conversion) ---
-                            pub_date_raw = job.get('pubDate') # timestamp in ms
-                            if pub_date_raw:
-                                pub_date = datetime.fromtimestamp(pub_date_raw / 1000).strftime('%Y-%m-%d')
-                            else:
-                                pub_date = "N/A"
-
-                            # Skills / tech stack
-                            # As analyzed, skills often appear in 'sortedMisMatchingEntityDisplayText' or 'sortedMatching...'
-                            match_model = job.get('jobSeekerMatchSummaryModel', {})
-                            
-                            # Combine both lists to get full detected entities
-                            skills_list = match_model.get('sortedMisMatchingEntityDisplayText', []) + \
-                                          match_model.get('sortedMatchingEntityDisplayText', [])
-                            
-                            # Clean up duplicates and empty strings
-                            skills_list = list(set([s for s in skills_list if s]))
-                            skills_str = ", ".join(skills_list)
-
-                            # Job attributes
-                            job_types = ", ".join(job.get('jobTypes', []))
-                            
-                            # Remote logic
-                            remote_model = job.get('remoteWorkModel', {})
-                            is_remote = job.get('remoteLocation', False)
-                            if remote_model.get('type') == 'REMOTE_ALWAYS':
-                                is_remote = True
-
-                            # Description snippet
-                            snippet_html = job.get('snippet', 'N/A')
-                            snippet_clean = re.sub('<[^<]+?>', '', snippet_html).replace("\n", " ").strip()
-
-                            # Company metrics
-                            
-                            all_jobs.append({
-                                "Job_Key": jk,
-                                "Title": job.get('displayTitle', job.get('title', 'N/A')),
-                                "Company": job.get('company', 'N/A'),
-                                "Rating": job.get('companyRating', 0),
-                                "Review_Count": job.get('companyReviewCount', 0),
-                                "Location": job.get('formattedLocation', 'N/A'),
-                                "Is_Remote": is_remote,
-                                "Salary_Text": salary_text,
-                                "Salary_Min": salary_min, # Useful for numerical analysis later
-                                "Salary_Max": salary_max, # Useful for numerical analysis later
-                                "Job_Type": job_types,
-                                "Date_Posted": pub_date,
-                                "Date_Created": job.get('formattedRelativeTime', 'N/A'), # e.g. "3 days ago"
-                                "Skills_Detected": skills_str,
-                                "Summary": snippet_clean,
-                                "Link": link
-                            })
-                        except Exception as e:
-                            print(f"    Error parsing individual job: {e}")
-                            continue
-
-                except json.JSONDecodeError:
-                    print("  -> Error decoding JSON data.")
-            else:
-                print("  ->  No JSON data block found (Layout might have changed or Captcha triggered).")
-
-            # Pagination
-            if current_page < max_pages:
-                try:
-                    # Handle "Sign in with Google" popups or other overlays
-                    close_selectors = ['button[aria-label="close"]', '.icl-CloseButton', '[id^="google-one-tap-container"]']
-                    for selector in close_selectors:
-                        if await page.locator(selector).count() > 0:
-                            if await page.locator(selector).is_visible():
-                                await page.locator(selector).click()
-                                await page.wait_for_timeout(500)
-
-                    # Find Next Button
-                    next_button = page.locator('[data-testid="pagination-page-next"]')
+                    if salary_obj:
+                        salary_min = salary_obj.get('min')
+                        salary_max = salary_obj.get('max')
+                        s_type = salary_obj.get('type', '')
+                        salary_text = f"{salary_min} - {salary_max} ({s_type})"
                     
-                    if await next_button.count() > 0:
-                        await next_button.scroll_into_view_if_needed()
-                        await next_button.click()
+                    # Fallback to the snippet text if structured data is missing
+                    if salary_text == "N/A":
+                        salary_text = job.get('salarySnippet', {}).get('text', 'N/A')
+
+                    # --- C. DATES (Timestamp Conversion) ---
+                    pub_date_raw = job.get('pubDate') # timestamp in ms
+                    if pub_date_raw:
+                        pub_date = datetime.fromtimestamp(pub_date_raw / 1000).strftime('%Y-%m-%d')
                     else:
-                        print("  -> 'Next' button not found. End of results.")
-                        break
+                        pub_date = "N/A"
+
+                    # Skills / tech stack
+                    # As analyzed, skills often appear in 'sortedMisMatchingEntityDisplayText' or 'sortedMatching...'
+                    match_model = job.get('jobSeekerMatchSummaryModel', {})
+                    
+                    # Combine both lists to get full detected entities
+                    skills_list = match_model.get('sortedMisMatchingEntityDisplayText', []) + \
+                                  match_model.get('sortedMatchingEntityDisplayText', [])
+                    
+                    # Clean up duplicates and empty strings
+                    skills_list = list(set([s for s in skills_list if s]))
+                    skills_str = ", ".join(skills_list)
+
+                    # Job attributes
+                    job_types = ", ".join(job.get('jobTypes', []))
+                    
+                    # Remote logic
+                    remote_model = job.get('remoteWorkModel', {})
+                    is_remote = job.get('remoteLocation', False)
+                    if remote_model.get('type') == 'REMOTE_ALWAYS':
+                        is_remote = True
+
+                    # Description snippet
+                    snippet_html = job.get('snippet', 'N/A')
+                    snippet_clean = re.sub('<[^<]+?>', '', snippet_html).replace("\n", " ").strip()
+
+                    # Company metrics
+                    
+                    jobs.append({
+                        "Job_Key": jk,
+                        "Title": job.get('displayTitle', job.get('title', 'N/A')),
+                        "Company": job.get('company', 'N/A'),
+                        "Rating": job.get('companyRating', 0),
+                        "Review_Count": job.get('companyReviewCount', 0),
+                        "Location": job.get('formattedLocation', 'N/A'),
+                        "Is_Remote": is_remote,
+                        "Salary_Text": salary_text,
+                        "Salary_Min": salary_min, # Useful for numerical analysis later
+                        "Salary_Max": salary_max, # Useful for numerical analysis later
+                        "Job_Type": job_types,
+                        "Date_Posted": pub_date,
+                        "Date_Created": job.get('formattedRelativeTime', 'N/A'), # e.g. "3 days ago"
+                        "Skills_Detected": skills_str,
+                        "Summary": snippet_clean,
+                        "Link": link
+                    })
+                except Exception as e:
+                    print(f"    Error parsing individual job: {e}")
+                    continue
+
+        except json.JSONDecodeError:
+            print("  -> Error decoding JSON data.")
+    else:
+        print("  ->  No JSON data block found (Layout might have changed or Captcha triggered).")
+
+    return jobs
+
+async def fetch_page(page, response=None):
+    """Wait for the job feed and grab the raw HTML. Returns (content, block_signal)."""
+    signal = await detect_block(page, response)
+    if signal:
+        return None, signal
+
+    # Ready as soon as the job-cards JSON we parse exists (no fixed delay)
+    if not await wait_for_mosaic(page, timeout=15000):
+        signal = await detect_block(page)
+        if signal:
+            return None, signal
+        print("  -> Jobs didn't load. Possible network issue.")
+        return None, None
+
+    # Parsing happens off the event loop in the ParsePipeline
+    return await page.content(), None
+
+async def quarantine_page(browser, page, quarantine, task, signal):
+    """Park a blocked (job_search, location, page) task and carry on with a fresh context"""
+    if quarantine.add(task, signal):
+        print(f"  -> {signal}. Page {task[2]} of '{task[0]}' quarantined for retry ({quarantine.summary()})")
+    else:
+        print(f"  -> Page {task[2]} of '{task[0]}' still blocked after {quarantine.max_attempts} attempts. Dropping it.")
+    await close_context(page)
+    return await new_page(browser)
+
+async def retry_due(browser, page, quarantine, pipeline, base_url=BASE_URL):
+    """Re-fetch quarantined tasks whose cooldown has expired; ones that fail again go back in"""
+    for task in quarantine.due():
+        job_search, location, page_num = task
+        url = page_url(job_search, location, page_num, base_url)
+        print(f"\n--- Retrying quarantined page {page_num} of '{job_search}' ---")
+        try:
+            response = await page.goto(url, timeout=60000)
+        except Exception as e:
+            print(f"  -> Error loading page {page_num}: {e}")
+            page = await quarantine_page(browser, page, quarantine, task, load_failure(url))
+            continue
+        content, signal = await fetch_page(page, response)
+        if signal or content is None:
+            page = await quarantine_page(browser, page, quarantine, task, signal or load_failure(url))
+        else:
+            await pipeline.put(content)
+    return page
+
+async def scrape_search(browser, page, recycler, pipeline, quarantine, job_search, location, max_pages,
+                        base_url=BASE_URL):
+    """Crawl one search's results pages; blocked pages go to the quarantine. Returns the current page."""
+    # Initial navigation
+    url = page_url(job_search, location, 1, base_url)
+    print(f"Navigating to: {url}")
+    
+    response = None
+    try:
+        response = await page.goto(url, timeout=60000)
+    except:
+        print("Page load timeout - reloading...")
+        response = await page.reload()
+
+    current_page = 1
+    while current_page <= max_pages:
+        print(f"\n--- Processing Page {current_page} of {max_pages} ---")
+        
+        content, signal = await fetch_page(page, response)
+        response = None
+
+        if signal:
+            # Skip ahead in a fresh context; the blocked page is retried later
+            page = await quarantine_page(browser, page, quarantine, (job_search, location, current_page), signal)
+            current_page += 1
+            if current_page <= max_pages:
+                try:
+                    response = await page.goto(page_url(job_search, location, current_page, base_url), timeout=60000)
                 except Exception as e:
-                    print(f"  -> Error navigating to next page: {e}")
+                    print(f"  -> Error loading page {current_page}: {e}")
+            continue
+        if content is None:
+            break
+        await pipeline.put(content)
+
+        # Swap in a fresh context once memory / latency watermarks are crossed
+        fresh = await recycler.after_navigation(page)
+        recycled, page = fresh is not page, fresh
+
+        # Pagination
+        current_page += 1
+        if current_page <= max_pages and recycled:
+            # New context has no results page to click through; jump by URL
+            try:
+                response = await page.goto(page_url(job_search, location, current_page, base_url), timeout=60000)
+            except Exception as e:
+                print(f"  -> Error loading page {current_page}: {e}")
+        elif current_page <= max_pages:
+            try:
+                # Handle "Sign in with Google" popups or other overlays
+                close_selectors = ['button[aria-label="close"]', '.icl-CloseButton', '[id^="google-one-tap-container"]']
+                for selector in close_selectors:
+                    if await page.locator(selector).count() > 0:
+                        if await page.locator(selector).is_visible():
+                            await page.locator(selector).click()
+                            await page.wait_for_timeout(500)
+
+                # Find Next Button
+                next_button = page.locator('[data-testid="pagination-page-next"]')
+                
+                if await next_button.count() > 0:
+                    await next_button.scroll_into_view_if_needed()
+                    await next_button.click()
+                else:
+                    print("  -> 'Next' button not found. End of results.")
                     break
+            except Exception as e:
+                print(f"  -> Error navigating to next page: {e}")
+                break
+    return page
+
+async def scrape_indeed(searches, base_url=BASE_URL, headless=False, parse_workers=2, profile=None,
+                        block_cooldown=BLOCK_COOLDOWN):
+    """Crawl (job_search, location, max_pages) searches in one browser with one shared quarantine"""
+    all_jobs = []
+    # Fetch/parse overlap: the browser moves on while workers parse the previous page
+    pipeline = await ParsePipeline(partial(parse_job_cards, base_url=base_url), all_jobs.extend,
+                                   workers=parse_workers, label="indeed").start()
+    quarantine = Quarantine(cooldown=block_cooldown)
+    
+    async with async_playwright() as p:
+        # Launch browser
+        # profile: persistent user-data dir whose HTTP cache is reused across runs
+        browser = await launch_browser(
+            p, profile,
+            headless=headless,
+            args=["--disable-blink-features=AutomationControlled", "--start-maximized"]
+        )
+        
+        page = await new_page(browser)
+        recycler = Recycler(lambda: new_page(browser))
+
+        for job_search, location, max_pages in searches:
+            print(f"\n=== Search '{job_search}' @ {location or '-'} ({max_pages} pages) ===")
+            page = await scrape_search(browser, page, recycler, pipeline, quarantine,
+                                       job_search, location, max_pages, base_url)
+            # Blocked pages whose cooldown is over are retried between searches
+            page = await retry_due(browser, page, quarantine, pipeline, base_url)
         
+        # --- RETRY QUARANTINED PAGES ---
+        # Only wait here, once there is nothing else left to crawl
+        while len(quarantine):
+            wait = quarantine.next_retry_in()
+            if wait:
+                print(f"\n{len(quarantine)} quarantined page(s), next retry in {wait:.0f}s")
+                await asyncio.sleep(wait)
+            page = await retry_due(browser, page, quarantine, pipeline, base_url)
+        if quarantine.dropped:
+            print(f"Quarantine: {quarantine.summary()}")
+
         await browser.close()
+        await pipeline.finish()
         return all_jobs
 
-if __name__ == "__main__":
-    # Settings
-    SEARCH_QUERY = "python developer"
-    LOCATION = "Remote"
-    PAGES_TO_SCRAPE = 38
-    
-    # Run Scraper
-    data = asyncio.run(scrape_indeed_rich_data(SEARCH_QUERY, LOCATION, max_pages=PAGES_TO_SCRAPE))
-    
+async def scrape_indeed_rich_data(job_search, location, max_pages=15, base_url=BASE_URL, headless=False,
+                                  parse_workers=2, profile=None, block_cooldown=BLOCK_COOLDOWN):
+    return await scrape_indeed([(job_search, location, max_pages)], base_url, headless, parse_workers,
+                               profile, block_cooldown)
+
+def save_jobs(data, filename=None):
+    """Save scraped rows to CSV (timestamped filename by default)"""
     if data:
         # Create DataFrame
         df = pd.DataFrame(data)
@@ -194,8 +310,19 @@ if __name__ == "__main__":
         print(df[['Title', 'Company', 'Salary_Text', 'Date_Posted', 'Skills_Detected']].head())
         
         # Save to CSV
-        filename = f"indeed_jobs_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
+        filename = filename or f"indeed_jobs_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
         df.to_csv(filename, index=False)
         print(f"Saved detailed data to {filename}")
+        return filename
     else:
-        print("No data extracted.")
\ No newline at end of file
+        print("No data extracted.")
+
+if __name__ == "__main__":
+    # Settings
+    SEARCH_QUERY = "python developer"
+    LOCATION = "Remote"
+    PAGES_TO_SCRAPE = 38
+    
+    # Run Scraper
+    data = asyncio.run(scrape_indeed_rich_data(SEARCH_QUERY, LOCATION, max_pages=PAGES_TO_SCRAPE))
+    save_jobs(data)
@@ -0,0 +1,353 @@
+"""Local stand-in for the three job boards.
+
+Serves deterministic Indeed-style (mosaic-provider-jobcards JSON),
+Monster-style (__NEXT_DATA__ jobResults) and IIMJobs-style (/j/ card
+links) result pages, plus a detail page behind every job link, so scrapers
+can be measured without touching the real sites. Page counts, latency,
+failure rate and CAPTCHA injection are set on MockConfig.
+
+    python mock_server.py --port 8765 --latency 50 200 --captcha-rate 0.05
+    python cli.py indeed --base-url http://127.0.0.1:8765 --headless -p 5
+"""
+import argparse
+import hashlib
+import html
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TITLES = ["Python Developer", "Backend Engineer", "Data Scientist", "DevOps Engineer",
+          "Software Engineer", "Full Stack Developer", "HR Business Partner",
+          "Talent Acquisition Manager", "Cloud Engineer", "QA Automation Engineer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries",
+             "Wayne Enterprises", "Tyrell Systems", "Soylent Data", "Cyberdyne"]
+LOCATIONS = ["Remote", "New York, NY", "Austin, TX", "Mumbai", "Bengaluru", "Gurgaon/Gurugram",
+             "Chicago, IL", "Remote in Seattle, WA"]
+SKILLS = ["Python", "AWS", "SQL", "Docker", "Kubernetes", "React", "Java", "Go",
+          "Recruitment", "Payroll", "HRIS", "Linux", "Terraform", "Django"]
+
+CAPTCHA_PAGE = """<html><head><title>Just a moment...</title></head>
+<body><div id="captcha"><div class="g-recaptcha" data-sitekey="mock"></div></div>
+<p>Verify you are human by completing the action below.</p></body></html>"""
+
+
+@dataclass
+class MockConfig:
+    pages: int = 10                 # max results pages per query
+    jobs_per_page: int = 15
+    latency: tuple = (0.0, 0.0)     # seconds, uniform(min, max) per response
+    failure_rate: float = 0.0       # share of responses answered with HTTP 500
+    captcha_rate: float = 0.0       # share of result pages replaced by a CAPTCHA
+    pool_size: int = 2000           # distinct jobs shared by all queries (controls overlap)
+    seed: int = 7
+
+
+@dataclass
+class MockStats:
+    requests: Counter = field(default_factory=Counter)
+    pages: Counter = field(default_factory=Counter)
+    details: Counter = field(default_factory=Counter)
+    failures: int = 0
+    captchas: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def count(self, site, kind):
+        with self.lock:
+            self.requests[site] += 1
+            if kind == "page":
+                self.pages[site] += 1
+            elif kind == "detail":
+                self.details[site] += 1
+            elif kind == "failure":
+                self.failures += 1
+            elif kind == "captcha":
+                self.captchas += 1
+
+
+def _hash(*parts):
+    return int(hashlib.md5("|".join(map(str, parts)).encode()).hexdigest()[:12], 16)
+
+
+# --- DATA GENERATION ---
+def total_results(config, query):
+    """Deterministic result count for a query (between 20% and 100% of the page limit)"""
+    full = config.pages * config.jobs_per_page
+    return max(1, int(full * (0.2 + 0.8 * (_hash(config.seed, "total", query) % 1000) / 1000)))
+
+
+def job_ids(config, query, page):
+    """Global job ids on a results page; queries take overlapping windows of the shared pool"""
+    total = total_results(config, query)
+    start = (page - 1) * config.jobs_per_page
+    offset = _hash(config.seed, "offset", query) % config.pool_size
+    return [(offset + i) % config.pool_size for i in range(start, min(start + config.jobs_per_page, total))]
+
+
+def job(config, gid):
+    rng = random.Random(_hash(config.seed, "job", gid))
+    posted = datetime.now() - timedelta(days=rng.randint(0, 30))
+    salary_min = rng.randint(40, 150) * 1000
+    return {
+        "id": gid,
+        "key": f"{gid:08x}{_hash('jk', gid) % 16**8:08x}",  # first 8 hex digits encode the id
+        "title": rng.choice(TITLES),
+        "company": rng.choice(COMPANIES),
+        "location": rng.choice(LOCATIONS),
+        "skills": rng.sample(SKILLS, 4),
+        "salary_min": salary_min,
+        "salary_max": salary_min + rng.randint(10, 60) * 1000,
+        "posted": posted,
+        "days_ago": (datetime.now() - posted).days,
+        "exp_min": rng.randint(1, 10),
+        "rating": round(rng.uniform(2.5, 5.0), 1),
+        "reviews": rng.randint(0, 5000),
+    }
+
+
+def _slug(text):
+    return "-".join("".join(c if c.isalnum() else " " for c in text.lower()).split())
+
+
+def _script_json(data):
+    # Keep a '</script>' inside strings from closing the tag early
+    return json.dumps(data).replace("</", "<\\/")
+
+
+# --- PAGE RENDERERS ---
+def indeed_page(config, query, location, start):
+    page = start // 10 + 1
+    jobs = [job(config, g) for g in job_ids(config, query, page)]
+    results = [{
+        "jobkey": j["key"],
+        "displayTitle": j["title"],
+        "title": j["title"],
+        "company": j["company"],
+        "companyRating": j["rating"],
+        "companyReviewCount": j["reviews"],
+        "formattedLocation": j["location"],
+        "remoteLocation": j["location"].startswith("Remote"),
+        "remoteWorkModel": {"type": "REMOTE_ALWAYS" if j["location"] == "Remote" else ""},
+        "extractedSalary": {"min": j["salary_min"], "max": j["salary_max"], "type": "YEARLY"},
+        "pubDate": int(j["posted"].timestamp() * 1000),
+        "formattedRelativeTime": f"{j['days_ago']} days ago",
+        "jobSeekerMatchSummaryModel": {"sortedMisMatchingEntityDisplayText": j["skills"][:2],
+                                       "sortedMatchingEntityDisplayText": j["skills"][2:]},
+        "jobTypes": ["Full-time"],
+        "snippet": f"<ul><li>{j['title']} working with {', '.join(j['skills'])}.</li></ul>",
+    } for j in jobs]
+    total = total_results(config, query)
+    data = {"metaData": {"mosaicProviderJobCardsModel": {"results": results, "totalJobCount": total}}}
+    cards = "".join(f'<li class="job_seen_beacon"><h2>{html.escape(r["title"])}</h2></li>' for r in results)
+    has_next = page < config.pages and page * config.jobs_per_page < total
+    nxt = (f'<a data-testid="pagination-page-next" href="/jobs?q={html.escape(query)}'
+           f'&l={html.escape(location)}&start={start + 10}">Next</a>') if has_next else ""
+    return f"""<html><head><title>{html.escape(query)} jobs</title></head><body>
+<div class="jobsearch-JobCountAndSortPane-jobCount"><span>{total:,} jobs</span></div>
+<div id="mosaic-provider-jobcards"><ul>{cards}</ul></div>
+<nav>{nxt}</nav>
+<script>window.mosaic = window.mosaic || {{providerData: {{}}}};
+window.mosaic.providerData["mosaic-provider-jobcards"]={_script_json(data)};</script>
+</body></html>"""
+
+
+def monster_page(config, query, page, origin=""):
+    jobs = [job(config, g) for g in job_ids(config, query, page)]
+    results = [{
+        "jobId": f"m-{j['id']}",
+        "jobTitle": j["title"],
+        "company": {"name": j["company"]},
+        "location": j["location"],
+        "datePosted": j["posted"].strftime("%Y-%m-%dT%H:%M:%S"),
+        "salary": {"salaryText": f"${j['salary_min']:,} - ${j['salary_max']:,} / year"},
+        "jobPostingUrl": f"{origin}/job-openings/{_slug(j['title'])}--m-{j['id']}",
+    } for j in jobs]
+    data = {"props": {"pageProps": {"dehydratedState": {"queries": [
+        {"state": {"data": {"jobResults": results, "estimatedTotalSize": total_results(config, query)}}}
+    ]}}}}
+    cards = "".join(
+        f'<div data-testid="job-card-component"><a data-testid="jobTitle" href="{r["jobPostingUrl"]}">'
+        f'{html.escape(r["jobTitle"])}</a><span data-testid="company">{html.escape(r["company"]["name"])}</span>'
+        f'<span data-testid="jobLocation">{html.escape(r["location"])}</span></div>' for r in results)
+    return f"""<html><head><title>{html.escape(query)} jobs | Monster</title></head><body>
+<div id="card-scroll-container">{cards}</div>
+<script id="__NEXT_DATA__" type="application/json">{_script_json(data)}</script>
+</body></html>"""
+
+
+def iim_page(config, category, page):
+    jobs = [job(config, g) for g in job_ids(config, category, page)]
+    cards = []
+    for pos, j in enumerate(jobs, 1):
+        name = f"{j['company']} - {j['title']}"
+        href = f"/j/{_slug(name)}-{1600000 + j['id']}?ref=sp&jobPos={pos}"
+        cards.append(
+            f'<div class="job-card"><a href="{href}"><span>{html.escape(name)}</span>\n'
+            f'<span>{j["exp_min"]} - {j["exp_min"] + 5} yrs</span> . <span>{html.escape(j["location"])}</span>\n'
+            f'<span>{j["rating"]}</span> <span>{j["reviews"]:,}+ Reviews</span>\n'
+            f'<span>Posted {j["days_ago"]} days ago</span></a></div>')
+    return f"""<html><head><title>{html.escape(category)} jobs | iimjobs</title></head><body>
+<div class="job-list">{"".join(cards)}</div>
+</body></html>"""
+
+
+def detail_page(config, gid, site):
+    """Job detail page with schema.org JobPosting JSON-LD plus a site-style description block"""
+    j = job(config, gid)
+    requirements = [f"{j['exp_min']}+ years of experience"] + [f"Hands-on {s}" for s in j["skills"]]
+    description = (f"{j['company']} is hiring a {j['title']} in {j['location']}. "
+                   f"You will work with {', '.join(j['skills'])} across the team.")
+    ld = {"@context": "https://schema.org", "@type": "JobPosting", "title": j["title"],
+          "description": f"<p>{description}</p><h3>Requirements</h3><ul>"
+                         + "".join(f"<li>{r}</li>" for r in requirements) + "</ul>",
+          "hiringOrganization": {"@type": "Organization", "name": j["company"]},
+          "employmentType": "FULL_TIME", "datePosted": j["posted"].strftime("%Y-%m-%d")}
+    container = {"indeed": 'id="jobDescriptionText"', "monster": 'data-testid="svx-description-container"',
+                 "iim": 'class="job-description"'}[site]
+    return f"""<html><head><title>{html.escape(j['title'])}</title>
+<script type="application/ld+json">{_script_json(ld)}</script></head><body>
+<h1>{html.escape(j['title'])}</h1>
+<div {container}><p>{html.escape(description)}</p><h3>Requirements</h3>
+<ul>{"".join(f"<li>{html.escape(r)}</li>" for r in requirements)}</ul></div>
+</body></html>"""
+
+
+# --- SERVER ---
+class MockHandler(BaseHTTPRequestHandler):
+    server_version = "MockJobBoard/1.0"
+
+    def log_message(self, format, *args):
+        pass  # keep load-test output readable
+
+    def _send(self, status, body):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        config, stats = self.server.config, self.server.stats
+        url = urlparse(self.path)
+        qs = {k: v[0] for k, v in parse_qs(url.query).items()}
+        kind = "page"
+
+        if url.path == "/jobs":
+            site, render = "indeed", lambda: indeed_page(
+                config, qs.get("q", ""), qs.get("l", ""), int(qs.get("start", 0)))
+        elif url.path == "/jobs/search":
+            origin = f"http://{self.headers.get('Host', '')}"
+            site, render = "monster", lambda: monster_page(
+                config, qs.get("q", ""), int(qs.get("page", 1)), origin)
+        elif url.path.startswith("/search/") and url.path.endswith("-jobs"):
+            category = url.path[len("/search/"):-len("-jobs")].replace("-", " ")
+            site, render = "iim", lambda: iim_page(config, category, int(qs.get("page", 1)))
+        elif url.path == "/viewjob" and len(qs.get("jk", "")) == 16:
+            kind, site = "detail", "indeed"
+            render = lambda: detail_page(config, int(qs["jk"][:8], 16), site)
+        elif url.path.startswith("/job-openings/") and "--m-" in url.path:
+            kind, site = "detail", "monster"
+            render = lambda: detail_page(config, int(url.path.rsplit("--m-", 1)[1]), site)
+        elif url.path.startswith("/j/"):
+            kind, site = "detail", "iim"
+            render = lambda: detail_page(config, int(url.path.rsplit("-", 1)[1]) - 1600000, site)
+        else:
+            stats.count("other", "miss")
+            return self._send(404, "<html><body>Not found</body></html>")
+
+        rng = self.server.rng
+        with stats.lock:
+            delay = rng.uniform(*config.latency)
+            roll = rng.random()
+        if delay:
+            time.sleep(delay)
+
+        if roll < config.failure_rate:
+            stats.count(site, "failure")
+            return self._send(500, "<html><body>Internal Server Error</body></html>")
+        if roll < config.failure_rate + config.captcha_rate:
+            stats.count(site, "captcha")
+            return self._send(200, CAPTCHA_PAGE)
+
+        stats.count(site, kind)
+        self._send(200, render())
+
+
+class MockJobBoard:
+    """ThreadingHTTPServer running in a background thread; use as a context manager"""
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.config = config or MockConfig()
+        self.httpd = ThreadingHTTPServer((host, port), MockHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.config = self.config
+        self.httpd.stats = MockStats()
+        self.httpd.rng = random.Random(self.config.seed)
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self):
+        return self.httpd.stats
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def add_config_arguments(parser):
+    parser.add_argument("--pages", type=int, default=10, help="max results pages per query")
+    parser.add_argument("--jobs-per-page", type=int, default=15)
+    parser.add_argument("--latency", type=float, nargs=2, default=[0.0, 0.0], metavar=("MIN_MS", "MAX_MS"),
+                        help="per-response latency range in milliseconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--captcha-rate", type=float, default=0.0)
+    parser.add_argument("--pool-size", type=int, default=2000, help="distinct jobs shared by all queries")
+    parser.add_argument("--seed", type=int, default=7)
+
+
+def config_from_args(args):
+    return MockConfig(pages=args.pages, jobs_per_page=args.jobs_per_page,
+                      latency=(args.latency[0] / 1000, args.latency[1] / 1000),
+                      failure_rate=args.failure_rate, captcha_rate=args.captcha_rate,
+                      pool_size=args.pool_size, seed=args.seed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock Indeed / Monster / IIMJobs server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    board = MockJobBoard(config_from_args(args), args.host, args.port)
+    print(f"Mock job board on {board.url}  (Ctrl+C to stop)")
+    try:
+        board.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        board.httpd.server_close()
+        print(f"Served: {dict(board.stats.pages)} pages, {dict(board.stats.details)} detail pages, "
+              f"{board.stats.failures} failures, {board.stats.captchas} captchas")
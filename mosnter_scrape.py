@@ -1,8 +1,9 @@
 import json
 import time
-import random
-import pandas as pd
-from playwright.sync_api import sync_playwright
+from block_detection import BLOCK_COOLDOWN, Quarantine, detect_block_sync, load_failure
+from browser_profile import close_context_sync, launch_browser_sync
+from context_recycler import RecyclerSync
+from readiness import scroll_until_stable_sync, wait_for_next_data_sync, wait_for_stable_cards_sync
 
 # --- CONFIGURATION ---
 # List of 20 tech-related job titles to scrape
@@ -30,182 +31,256 @@ JOB_KEYWORDS = [
 ]
 
 LOCATION = "Remote"
+BASE_URL = "https://www.monster.com"
 PAGES_TO_SCRAPE_PER_KEYWORD = 5  # 5 pages * 20 keywords = 100 pages total
 OUTPUT_FILE = "monster_jobs_all.csv"
+CARD_SELECTOR = 'div[data-testid="job-card-component"], article'
 
-def run():
-    print(f">>> Initializing Playwright Scraper for {len(JOB_KEYWORDS)} keywords x {PAGES_TO_SCRAPE_PER_KEYWORD} pages...")
+def new_page(browser):
+    """Create a fresh stealth context + page (also used to replace a blocked one)"""
+    context = browser.new_context(
+        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        viewport={'width': 1920, 'height': 1080},
+        locale='en-US',
+        timezone_id='America/New_York'
+    )
+    page = context.new_page()
+
+    # Inject Stealth JavaScript (on the page: with --profile every call gets the same context)
+    page.add_init_script("""
+        Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+    """)
+    return page
+
+def scrape_page(page, keyword, current_page, location=LOCATION, base_url=BASE_URL):
+    """Scrape one results page. Returns (jobs, block_signal); jobs is None on error."""
+    search_query = keyword.replace(" ", "+")
+
+    # Construct URL dynamically
+    url = f"{base_url}/jobs/search?q={search_query}&where={location}&page={current_page}&so=m.h.s"
+
+    page_jobs = []
+    found_json = False
+
+    try:
+        print(f">>> Navigating to: {url}")
+        response = page.goto(url, timeout=60000)
+
+        signal = detect_block_sync(page, response)
+        if signal:
+            print(f"!!! ANTI-BOT DETECTION TRIGGERED ({signal}).")
+            return [], signal
+        
+        # Ready as soon as __NEXT_DATA__ carries jobResults (no networkidle / fixed sleeps)
+        if not wait_for_next_data_sync(page, timeout=10000):
+            print(">>> __NEXT_DATA__ not ready, trying cards...")
+
+        # --- STRATEGY 1: JSON Extraction ---
+        try:
+            raw_json = page.evaluate("""() => {
+                const script = document.getElementById('__NEXT_DATA__');
+                return script ? script.innerText : null;
+            }""")
+
+            if raw_json:
+                data = json.loads(raw_json)
+                queries = data.get('props', {}).get('pageProps', {}).get('dehydratedState', {}).get('queries', [])
+                
+                for query in queries:
+                    state_data = query.get('state', {}).get('data', {})
+                    if state_data and 'jobResults' in state_data:
+                        results = state_data.get('jobResults', [])
+                        for job in results:
+                            page_jobs.append({
+                                "Job ID": job.get('jobId'),
+                                "Title": job.get('jobTitle'),
+                                "Company": job.get('company', {}).get('name'),
+                                "Location": job.get('location'),
+                                "Date Posted": job.get('datePosted'),
+                                "Salary": job.get('salary', {}).get('salaryText') or "N/A",
+                                "Apply URL": job.get('jobPostingUrl'),
+                                "Source": "JSON",
+                                "Keyword": keyword # Track which keyword found this job
+                            })
+                        found_json = True
+                        break
+                if found_json:
+                    print(f">>> Extracted {len(page_jobs)} jobs from JSON.")
+        except Exception:
+            pass
+
+        # An empty jobResults is past the last page: no cards will render either
+        if found_json and not page_jobs:
+            print(f">>> No jobs in jobResults on page {current_page} (end of results).")
+            return [], None
+
+        # --- STRATEGY 2: Visual Fallback (If no jobResults in the JSON) ---
+        if not found_json:
+            print(">>> No jobResults in JSON. Switching to Visual Scraping...")
+            # Lazy-loaded cards: wait for a stable count, then scroll until it stops growing
+            if wait_for_stable_cards_sync(page, CARD_SELECTOR, timeout=20000):
+                scroll_until_stable_sync(page, CARD_SELECTOR)
+            else:
+                # Check if we hit a captcha or block
+                signal = detect_block_sync(page)
+                if signal:
+                    print(f"!!! ANTI-BOT DETECTION TRIGGERED ({signal}).")
+                    return [], signal
+
+                print(f"!!! No cards found on page {current_page}. Taking screenshot...")
+                page.screenshot(path=f"debug_error_{keyword.replace(' ', '_')}_{current_page}.png")
+                print(f"!!! Screenshot saved. Checking Page Title: {page.title()}")
+                return [], None # Stop loop if no cards found
+
+            cards = page.locator('div[data-testid="job-card-component"]').all()
+            if not cards:
+                cards = page.locator('article').all()
+            
+            print(f">>> Found {len(cards)} visual cards.")
+
+            for card in cards:
+                try:
+                    title_el = card.locator('[data-testid="jobTitle"]')
+                    company_el = card.locator('[data-testid="company"]')
+                    loc_el = card.locator('[data-testid="jobLocation"]')
+                    
+                    link = title_el.get_attribute('href')
+                    if link and not link.startswith('http'):
+                        link = 'https:' + link
+
+                    page_jobs.append({
+                        "Job ID": "N/A",
+                        "Title": title_el.inner_text().strip() if title_el.count() else "N/A",
+                        "Company": company_el.inner_text().strip() if company_el.count() else "N/A",
+                        "Location": loc_el.inner_text().strip() if loc_el.count() else "N/A",
+                        "Date Posted": "N/A",
+                        "Salary": "N/A",
+                        "Apply URL": link,
+                        "Source": "Visual",
+                        "Keyword": keyword
+                    })
+                except:
+                    continue
+
+    except Exception as e:
+        print(f"!!! Error on page {current_page} for '{keyword}': {e}")
+        return None, None
+
+    return page_jobs, None
+
+def quarantine_task(browser, page, quarantine, task, signal):
+    """Park a blocked (keyword, page, location) task and swap in a fresh context"""
+    if quarantine.add(task, signal):
+        print(f"!!! Quarantined {task} for retry ({quarantine.summary()})")
+    else:
+        print(f"!!! {task} still blocked after {quarantine.max_attempts} attempts. Dropping it.")
+    close_context_sync(page)
+    return new_page(browser)
+
+def retry_due(browser, page, quarantine, all_jobs_data, base_url=BASE_URL):
+    """Re-scrape quarantined (keyword, page, location) tasks whose cooldown has expired"""
+    for task in quarantine.due():
+        print(f"\n>>> Retrying quarantined {task}")
+        page_jobs, signal = scrape_page(page, *task, base_url=base_url)
+        if signal or page_jobs is None:
+            page = quarantine_task(browser, page, quarantine, task, signal or load_failure(page.url))
+        elif page_jobs:
+            all_jobs_data.extend(page_jobs)
+    return page
+
+def run(keywords=JOB_KEYWORDS, location=LOCATION, pages=PAGES_TO_SCRAPE_PER_KEYWORD, output_file=OUTPUT_FILE,
+        base_url=BASE_URL, headless=False, searches=None, profile=None, block_cooldown=BLOCK_COOLDOWN):
+    """searches: optional (keyword, location, pages) list (e.g. from planner.py) overriding the fixed grid;
+    profile: persistent browser profile dir whose HTTP cache is reused across runs;
+    block_cooldown: seconds before a blocked (keyword, page, location) is retried"""
+    # Heavy imports live here so the CLI can read JOB_KEYWORDS without them
+    from playwright.sync_api import sync_playwright
+
+    if searches is None:
+        searches = [(keyword, location, pages) for keyword in keywords]
+    print(f">>> Initializing Playwright Scraper for {len(searches)} searches, "
+          f"{sum(s[2] for s in searches)} pages...")
     
     all_jobs_data = []
+    quarantine = Quarantine(cooldown=block_cooldown)
 
     with sync_playwright() as p:
         # Launch browser (headless=False is SAFER to avoid detection)
-        browser = p.chromium.launch(
-            headless=False, 
+        browser = launch_browser_sync(
+            p, profile,
+            headless=headless,
             args=["--disable-blink-features=AutomationControlled"]
         )
         
-        # Create a stealth context
-        context = browser.new_context(
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            viewport={'width': 1920, 'height': 1080},
-            locale='en-US',
-            timezone_id='America/New_York'
-        )
-        
-        # Inject Stealth JavaScript
-        context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-        """)
-
-        page = context.new_page()
+        page = new_page(browser)
+        recycler = RecyclerSync(lambda: new_page(browser))
 
         # --- KEYWORD LOOP ---
-        for keyword in JOB_KEYWORDS:
-            search_query = keyword.replace(" ", "+")
-            print(f"\n\n=== STARTING SCRAPE FOR KEYWORD: '{keyword}' ===")
+        for keyword, location, pages in searches:
+            print(f"\n\n=== STARTING SCRAPE FOR KEYWORD: '{keyword}' ({location}, {pages} pages) ===")
 
             # --- PAGINATION LOOP ---
-            for current_page in range(1, PAGES_TO_SCRAPE_PER_KEYWORD + 1):
-                print(f"\n--- SCRAPING PAGE {current_page} of {PAGES_TO_SCRAPE_PER_KEYWORD} (Keyword: {keyword}) ---")
-                
-                # Construct URL dynamically
-                url = f"https://www.monster.com/jobs/search?q={search_query}&where={LOCATION}&page={current_page}&so=m.h.s"
-                
-                try:
-                    print(f">>> Navigating to: {url}")
-                    page.goto(url, timeout=60000)
-                    
-                    # Wait for network idle (handle redirects)
-                    try:
-                        page.wait_for_load_state("networkidle", timeout=10000)
-                    except:
-                        print(">>> Network busy, proceeding anyway...")
-
-                    # Random sleep (mimic human reading)
-                    time.sleep(random.uniform(3, 6))
-
-                    # Scroll to bottom to trigger lazy loading
-                    try:
-                        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                        time.sleep(3)
-                    except:
-                        pass
-
-                    page_jobs = []
-                    
-                    # --- STRATEGY 1: JSON Extraction ---
-                    try:
-                        raw_json = page.evaluate("""() => {
-                            const script = document.getElementById('__NEXT_DATA__');
-                            return script ? script.innerText : null;
-                        }""")
-
-                        if raw_json:
-                            data = json.loads(raw_json)
-                            queries = data.get('props', {}).get('pageProps', {}).get('dehydratedState', {}).get('queries', [])
-                            
-                            found_json = False
-                            for query in queries:
-                                state_data = query.get('state', {}).get('data', {})
-                                if state_data and 'jobResults' in state_data:
-                                    results = state_data.get('jobResults', [])
-                                    for job in results:
-                                        page_jobs.append({
-                                            "Job ID": job.get('jobId'),
-                                            "Title": job.get('jobTitle'),
-                                            "Company": job.get('company', {}).get('name'),
-                                            "Location": job.get('location'),
-                                            "Date Posted": job.get('datePosted'),
-                                            "Salary": job.get('salary', {}).get('salaryText') or "N/A",
-                                            "Apply URL": job.get('jobPostingUrl'),
-                                            "Source": "JSON",
-                                            "Keyword": keyword # Track which keyword found this job
-                                        })
-                                    found_json = True
-                                    break
-                            if found_json:
-                                print(f">>> Extracted {len(page_jobs)} jobs from JSON.")
-                    except Exception:
-                        pass
-
-                    # --- STRATEGY 2: Visual Fallback (If JSON empty) ---
-                    if not page_jobs:
-                        print(">>> JSON empty. Switching to Visual Scraping...")
-                        try:
-                            # Increased timeout to 20s and added error debugging
-                            page.wait_for_selector('div[data-testid="job-card-component"], article', timeout=20000)
-                        except:
-                            print(f"!!! No cards found on page {current_page}. Taking screenshot...")
-                            page.screenshot(path=f"debug_error_{keyword.replace(' ', '_')}_{current_page}.png")
-                            print(f"!!! Screenshot saved. Checking Page Title: {page.title()}")
-                            
-                            # Check if we hit a captcha or block
-                            content = page.content().lower()
-                            if "captcha" in content or "robot" in content or "denied" in content:
-                                print("!!! ANTI-BOT DETECTION TRIGGERED.")
-                            
-                            break # Stop loop if no cards found
-
-                        cards = page.locator('div[data-testid="job-card-component"]').all()
-                        if not cards:
-                            cards = page.locator('article').all()
-                        
-                        print(f">>> Found {len(cards)} visual cards.")
-
-                        for card in cards:
-                            try:
-                                title_el = card.locator('[data-testid="jobTitle"]')
-                                company_el = card.locator('[data-testid="company"]')
-                                loc_el = card.locator('[data-testid="jobLocation"]')
-                                
-                                link = title_el.get_attribute('href')
-                                if link and not link.startswith('http'):
-                                    link = 'https:' + link
-
-                                page_jobs.append({
-                                    "Job ID": "N/A",
-                                    "Title": title_el.inner_text().strip() if title_el.count() else "N/A",
-                                    "Company": company_el.inner_text().strip() if company_el.count() else "N/A",
-                                    "Location": loc_el.inner_text().strip() if loc_el.count() else "N/A",
-                                    "Date Posted": "N/A",
-                                    "Salary": "N/A",
-                                    "Apply URL": link,
-                                    "Source": "Visual",
-                                    "Keyword": keyword
-                                })
-                            except:
-                                continue
-
-                    # Add page results to main list
-                    if page_jobs:
-                        all_jobs_data.extend(page_jobs)
-                        print(f">>> Page {current_page} complete. Total jobs so far: {len(all_jobs_data)}")
-                    else:
-                        print("!!! No jobs found on this page. Moving to next keyword.")
-                        break
+            for current_page in range(1, pages + 1):
+                print(f"\n--- SCRAPING PAGE {current_page} of {pages} (Keyword: {keyword}) ---")
+
+                page_jobs, signal = scrape_page(page, keyword, current_page, location, base_url)
+
+                # Blocked pages are retried later; the rest of the crawl keeps going
+                if signal:
+                    page = quarantine_task(browser, page, quarantine, (keyword, current_page, location), signal)
+                    continue
+                if page_jobs is None:
+                    continue
 
-                except Exception as e:
-                    print(f"!!! Error on page {current_page} for '{keyword}': {e}")
+                # Add page results to main list
+                if page_jobs:
+                    all_jobs_data.extend(page_jobs)
+                    print(f">>> Page {current_page} complete. Total jobs so far: {len(all_jobs_data)}")
+                    # Swap in a fresh context once memory / latency watermarks are crossed
+                    page = recycler.after_navigation(page)
+                else:
+                    print("!!! No jobs found on this page. Moving to next keyword.")
+                    break
 
             # Small pause between keywords to be polite
             print(f">>> Finished keyword '{keyword}'. Sleeping briefly...")
             time.sleep(5)
 
+            # Retry any quarantined pages whose cooldown is over
+            page = retry_due(browser, page, quarantine, all_jobs_data, base_url)
+
+        # --- DRAIN QUARANTINE ---
+        # Only wait here, once there is nothing else left to crawl
+        while len(quarantine):
+            wait = quarantine.next_retry_in()
+            if wait:
+                print(f">>> {len(quarantine)} quarantined page(s), next retry in {wait:.0f}s")
+                time.sleep(wait)
+            page = retry_due(browser, page, quarantine, all_jobs_data, base_url)
+        if quarantine.dropped:
+            print(f"!!! Quarantine: {quarantine.summary()}")
+
         # --- SAVE FINAL DATA ---
-        print("\n>>> SAVING DATA...")
-        if all_jobs_data:
-            df = pd.DataFrame(all_jobs_data)
-            # Remove duplicates based on Apply URL
-            df.drop_duplicates(subset=['Apply URL'], keep='first', inplace=True)
-            
-            df.to_csv(OUTPUT_FILE, index=False)
-            print(f">>> SUCCESS! Saved {len(df)} unique jobs to '{OUTPUT_FILE}'")
-            print(df.head())
-        else:
-            print("!!! No data extracted.")
-        
+        save_jobs(all_jobs_data, output_file)
+
         browser.close()
+        return all_jobs_data
+
+def save_jobs(all_jobs_data, output_file=OUTPUT_FILE):
+    """Write rows to CSV, de-duplicated on Apply URL"""
+    import pandas as pd
+
+    print("\n>>> SAVING DATA...")
+    if all_jobs_data:
+        df = pd.DataFrame(all_jobs_data)
+        # Remove duplicates based on Apply URL
+        df.drop_duplicates(subset=['Apply URL'], keep='first', inplace=True)
+
+        df.to_csv(output_file, index=False)
+        print(f">>> SUCCESS! Saved {len(df)} unique jobs to '{output_file}'")
+        print(df.head())
+    else:
+        print("!!! No data extracted.")
 
 if __name__ == "__main__":
     run()
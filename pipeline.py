@@ -0,0 +1,99 @@
+"""Producer/consumer pipeline that overlaps page fetching with parsing.
+
+Fetchers (the browser loop) put raw payloads into a bounded asyncio queue
+and move straight on to the next navigation; parse workers hand each
+payload to a thread or process pool, so json.loads / regex work never runs
+on the event loop. Results are delivered to on_rows in submission order.
+
+Queue depth and producer wait time are reported at the end to tune the
+fetcher/parser balance: a full queue and long producer waits mean more
+parse workers are needed; an empty queue with idle parsers means fewer.
+"""
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class ParsePipeline:
+    def __init__(self, parse, on_rows, workers=2, maxsize=4, processes=False, label="parse"):
+        self.parse = parse              # picklable (module-level) when processes=True
+        self.on_rows = on_rows
+        self.workers = max(1, workers)
+        self.maxsize = maxsize
+        self.processes = processes
+        self.label = label
+        self.queue = None
+        self.executor = None
+        self.tasks = []
+        self._seq = 0
+        self._next = 0
+        self._done = {}
+        # Stats
+        self.depths = []
+        self.producer_wait = 0.0
+        self.parse_seconds = 0.0
+        self.parser_idle = 0.0
+        self.started = None
+
+    @property
+    def depth(self):
+        return self.queue.qsize() if self.queue else 0
+
+    async def start(self):
+        self.queue = asyncio.Queue(self.maxsize)
+        pool = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+        self.executor = pool(max_workers=self.workers)
+        self.tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self.started = time.perf_counter()
+        return self
+
+    async def put(self, payload):
+        """Queue a raw payload; only waits when parsers are behind (backpressure)"""
+        waited = time.perf_counter()
+        await self.queue.put((self._seq, payload))
+        self.producer_wait += time.perf_counter() - waited
+        self._seq += 1
+        self.depths.append(self.queue.qsize())
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            idle = time.perf_counter()
+            item = await self.queue.get()
+            self.parser_idle += time.perf_counter() - idle
+            if item is None:
+                return
+            seq, payload = item
+            began = time.perf_counter()
+            try:
+                rows = await loop.run_in_executor(self.executor, self.parse, payload)
+            except Exception as e:
+                print(f"  -> [{self.label}] parse error: {e}")
+                rows = []
+            self.parse_seconds += time.perf_counter() - began
+            self._deliver(seq, rows)
+
+    def _deliver(self, seq, rows):
+        # Re-order so results reach on_rows in the order pages were fetched
+        self._done[seq] = rows
+        while self._next in self._done:
+            self.on_rows(self._done.pop(self._next) or [])
+            self._next += 1
+
+    async def finish(self):
+        """Drain the queue, stop the workers and print the balance report"""
+        for _ in self.tasks:
+            await self.queue.put(None)
+        await asyncio.gather(*self.tasks)
+        self.executor.shutdown()
+        self.report()
+
+    def report(self):
+        if not self.depths:
+            return
+        elapsed = time.perf_counter() - self.started
+        mean = sum(self.depths) / len(self.depths)
+        print(f"\n[{self.label}] pipeline: {self._seq} payloads, queue depth mean {mean:.1f} / "
+              f"max {max(self.depths)} (limit {self.maxsize}); fetchers waited {self.producer_wait:.2f}s, "
+              f"{self.workers} parsers busy {self.parse_seconds:.2f}s / idle {self.parser_idle:.2f}s "
+              f"over {elapsed:.1f}s")
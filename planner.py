@@ -0,0 +1,131 @@
+"""Query fan-out planner: size each search's pagination from its result count.
+
+Overlapping keyword sets ("python developer", "backend developer",
+"software engineer") mostly return the same jobs, so a fixed page count per
+query wastes fetches. The planner fetches the first results page of every
+(query, location) pair, reads the site's total-result metadata and the job
+keys on that page, then walks the searches broadest first: a search whose
+first page is mostly jobs already seen (on an earlier probe or in the master
+store) gets proportionally fewer pages, one with nothing new gets none.
+
+The resulting page_plan {(query, location): pages} is ordered by expected
+new jobs and read by SitePlugin.searches(), so scrapers run the most
+productive searches first and skip the rest.
+"""
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field
+
+from block_detection import status_signal
+from http_pacing import USER_AGENT, DomainPacer
+
+
+@dataclass
+class Probe:
+    query: str
+    location: str
+    total: int = None           # site's result count, None when the page has none
+    keys: list = field(default_factory=list)
+    failed: str = ""            # blocked / HTTP error: fall back to the fixed page count
+
+
+@dataclass
+class Allocation:
+    query: str
+    location: str
+    pages: int
+    total: int = None
+    new_ratio: float = 1.0      # share of first-page jobs not seen before
+    expected_new: float = 0.0
+    reason: str = ""
+
+
+async def probe_all(site, searches, base_url=None, workers=4, min_interval=1.0, timeout=30000):
+    """Fetch the first results page of every (query, location) and parse its metadata"""
+    from playwright.async_api import async_playwright
+
+    pacer = DomainPacer(min_interval)
+    probes = [Probe(q, loc) for q, loc in searches]
+    queue = asyncio.Queue()
+    for probe in probes:
+        queue.put_nowait(probe)
+
+    async def worker(request):
+        while True:
+            try:
+                probe = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            url = site.probe_url(probe.query, probe.location, base_url)
+            try:
+                await pacer.wait(url)
+                response = await request.get(url, timeout=timeout)
+                signal = status_signal(response)
+                if signal or not response.ok:
+                    probe.failed = signal.kind if signal else f"HTTP {response.status}"
+                    continue
+                probe.total, probe.keys = await asyncio.to_thread(site.parse_probe, await response.text())
+            except Exception as e:
+                probe.failed = str(e).splitlines()[0]
+
+    async with async_playwright() as p:
+        request = await p.request.new_context(user_agent=USER_AGENT,
+                                              extra_http_headers={"Accept-Language": "en-US,en;q=0.9"})
+        try:
+            await asyncio.gather(*(worker(request) for _ in range(max(1, workers))))
+        finally:
+            await request.dispose()
+    return probes
+
+
+def allocate(probes, max_pages, known=frozenset()):
+    """Pages per search, broadest first, scaled by the share of first-page jobs that are new"""
+    seen = set(known)
+    allocations = []
+    for probe in sorted(probes, key=lambda p: p.total or 0, reverse=True):
+        a = Allocation(probe.query, probe.location, max_pages, probe.total)
+        if probe.failed:
+            a.reason = f"probe failed ({probe.failed}), fixed page count"
+        elif not probe.keys:
+            a.pages, a.new_ratio, a.reason = 0, 0.0, "no results"
+        else:
+            fresh = [k for k in probe.keys if k not in seen]
+            a.new_ratio = len(fresh) / len(probe.keys)
+            seen.update(probe.keys)
+            available = math.ceil(probe.total / len(probe.keys)) if probe.total else max_pages
+            a.expected_new = (probe.total or len(probe.keys)) * a.new_ratio
+            if not fresh:
+                a.pages, a.reason = 0, "first page already seen"
+            else:
+                a.pages = max(1, math.ceil(min(max_pages, available) * a.new_ratio))
+                a.reason = f"{len(fresh)}/{len(probe.keys)} new on page 1, {available} page(s) available"
+        allocations.append(a)
+
+    # Schedule: most expected new jobs first; failed probes (unknown yield) last
+    allocations.sort(key=lambda a: (not a.reason.startswith("probe failed"), a.expected_new), reverse=True)
+    return allocations
+
+
+def plan_searches(site, settings, store=None, workers=4, min_interval=1.0):
+    """Probe, allocate and return the page_plan {(query, location): pages} for site.searches()"""
+    searches = [(q, loc) for q in settings["queries"] for loc in settings["locations"]]
+    started = time.perf_counter()
+    probes = asyncio.run(probe_all(site, searches, settings["base_url"], workers, min_interval))
+    known = set()
+    if store is not None:
+        known = store.existing_keys(site.name, {k for p in probes for k in p.keys})
+    allocations = allocate(probes, settings["pages"], known)
+    print_plan(site.name, allocations, settings["pages"], time.perf_counter() - started)
+    return {(a.query, a.location): a.pages for a in allocations}
+
+
+def print_plan(name, allocations, max_pages, seconds=0.0):
+    fixed = len(allocations) * max_pages
+    planned = sum(a.pages for a in allocations)
+    print(f"🧭 {name} plan: {planned} page fetches instead of {fixed} "
+          f"(+{len(allocations)} probes, {seconds:.1f}s)")
+    for a in allocations:
+        total = "?" if a.total is None else f"{a.total:,}"
+        print(f"  {a.pages:>3} page(s)  {a.query!r} @ {a.location or '-'}  "
+              f"[{total} results, ~{a.expected_new:.0f} new] {a.reason}")
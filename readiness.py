@@ -0,0 +1,93 @@
+"""Event-driven page readiness.
+
+Each helper resolves as soon as the data we actually extract is present
+instead of waiting for networkidle or sleeping a fixed time. Every wait
+returns a truthy value when ready and False on timeout (never raises), so
+callers can fall back the same way they did after a selector timeout.
+Async helpers are for the async Playwright API; *_sync twins for Monster.
+"""
+
+# --- READINESS CHECKS (evaluated in the page) ---
+NEXT_DATA_JS = """() => {
+    const el = document.getElementById('__NEXT_DATA__');
+    return !!(el && el.textContent.includes('jobResults'));
+}"""
+
+MOSAIC_JS = """() => !!(window.mosaic && window.mosaic.providerData &&
+    window.mosaic.providerData['mosaic-provider-jobcards'])"""
+
+# Resolves with the card count once it reached min_count and has not changed for stable_ms;
+# with emptyMs, resolves 'empty' once the loaded page has shown no cards for that long
+STABLE_CARDS_JS = """([sel, minCount, stableMs, emptyMs]) => {
+    const n = document.querySelectorAll(sel).length;
+    const seen = window.__cardCounts || (window.__cardCounts = {});
+    const now = performance.now();
+    if (!seen[sel] || seen[sel].n !== n) {
+        seen[sel] = {n: n, t: now};
+        return false;
+    }
+    if (n === 0 && emptyMs && document.readyState === 'complete' && now - seen[sel].t >= emptyMs) return 'empty';
+    return (n >= minCount && now - seen[sel].t >= stableMs) ? n : false;
+}"""
+
+CARD_COUNT_JS = "(sel) => document.querySelectorAll(sel).length"
+GREW_JS = "([sel, n]) => document.querySelectorAll(sel).length > n"
+SCROLL_JS = "window.scrollTo(0, document.body.scrollHeight)"
+
+POLL_MS = 100
+
+
+async def _wait(page, expression, arg=None, timeout=10000):
+    try:
+        handle = await page.wait_for_function(expression, arg=arg, timeout=timeout, polling=POLL_MS)
+        return await handle.json_value()
+    except Exception:
+        return False
+
+
+def _wait_sync(page, expression, arg=None, timeout=10000):
+    try:
+        return page.wait_for_function(expression, arg=arg, timeout=timeout, polling=POLL_MS).json_value()
+    except Exception:
+        return False
+
+
+async def wait_for_mosaic(page, timeout=15000):
+    """Indeed: ready once window.mosaic.providerData holds the job-cards model"""
+    return await _wait(page, MOSAIC_JS, timeout=timeout)
+
+
+def wait_for_next_data_sync(page, timeout=10000):
+    """Monster: ready once the __NEXT_DATA__ script carries jobResults"""
+    return _wait_sync(page, NEXT_DATA_JS, timeout=timeout)
+
+
+async def wait_for_stable_cards(page, selector, min_count=1, stable_ms=300, timeout=15000, empty_ms=0):
+    """Ready once at least min_count cards exist and the count stopped changing; returns the count.
+    With empty_ms, returns 'empty' for a loaded page without cards (past the last page) instead of timing out."""
+    return await _wait(page, STABLE_CARDS_JS, [selector, min_count, stable_ms, empty_ms], timeout)
+
+
+def wait_for_stable_cards_sync(page, selector, min_count=1, stable_ms=300, timeout=15000, empty_ms=0):
+    return _wait_sync(page, STABLE_CARDS_JS, [selector, min_count, stable_ms, empty_ms], timeout)
+
+
+async def scroll_until_stable(page, selector, grow_timeout=1500, max_rounds=20):
+    """Infinite scroll: keep scrolling while new cards arrive; stop when the count stops changing"""
+    count = await page.evaluate(CARD_COUNT_JS, selector)
+    for _ in range(max_rounds):
+        await page.evaluate(SCROLL_JS)
+        if not await _wait(page, GREW_JS, [selector, count], grow_timeout):
+            break
+        count = await page.evaluate(CARD_COUNT_JS, selector)
+    return count
+
+
+def scroll_until_stable_sync(page, selector, grow_timeout=1500, max_rounds=20):
+    count = page.evaluate(CARD_COUNT_JS, selector)
+    for _ in range(max_rounds):
+        page.evaluate(SCROLL_JS)
+        if not _wait_sync(page, GREW_JS, [selector, count], grow_timeout):
+            break
+        count = page.evaluate(CARD_COUNT_JS, selector)
+    return count
@@ -0,0 +1,229 @@
+"""Site plugin registry used by cli.py.
+
+Each plugin only imports its scraper module (and with it pandas/Playwright)
+inside run(), so listing sites, --help and --dry-run stay instant.
+"""
+import re
+from urllib.parse import quote_plus
+
+from block_detection import BLOCK_COOLDOWN
+
+SITES = {}
+
+
+def _first_int(patterns, text):
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return int(match.group(1).replace(",", ""))
+    return None
+
+
+def _unique(keys):
+    return list(dict.fromkeys(keys))
+
+
+def register_site(cls):
+    """Class decorator: add a SitePlugin subclass to the registry"""
+    SITES[cls.name] = cls()
+    return cls
+
+
+class SitePlugin:
+    name = ""
+    help = ""
+    default_queries = []
+    default_location = ""
+    default_pages = 10
+    default_output = None
+
+    def add_arguments(self, parser):
+        """Hook for site-specific options (common ones are added by the CLI)"""
+
+    def settings(self, args, config):
+        """Merge CLI args over the config-file section over the plugin defaults"""
+        section = config.get(self.name, {})
+        queries = args.query or section.get("queries") or self.default_queries
+        if isinstance(queries, str):
+            queries = [queries]
+        locations = args.location or section.get("locations") or [section.get("location", self.default_location)]
+        if isinstance(locations, str):
+            locations = [locations]
+        return {
+            "queries": list(queries),
+            "locations": list(locations),
+            "pages": args.pages if args.pages is not None else section.get("pages", self.default_pages),
+            "output": args.output or section.get("output") or self.default_output,
+            "base_url": args.base_url or section.get("base_url"),
+            "headless": args.headless or section.get("headless", False),
+            "parse_workers": args.parse_workers or section.get("parse_workers", 2),
+            "profile": args.profile or section.get("profile"),
+            "block_cooldown": (args.block_cooldown if args.block_cooldown is not None
+                               else section.get("block_cooldown", BLOCK_COOLDOWN)),
+            "store": None if args.no_store else (args.store or section.get("store") or config.get("store") or "jobs.db"),
+        }
+
+    def searches(self, settings):
+        """(query, location, pages) per search; sized and ordered by the planner's page_plan if any"""
+        plan = settings.get("page_plan")
+        if plan is not None:
+            return [(q, loc, pages) for (q, loc), pages in plan.items() if pages]
+        return [(q, loc, settings["pages"]) for q in settings["queries"] for loc in settings["locations"]]
+
+    def plan(self, settings):
+        """List the (query, location, page) tasks a run would fetch"""
+        return [(q, loc, page)
+                for q, loc, pages in self.searches(settings)
+                for page in range(1, pages + 1)]
+
+    def probe_url(self, query, location, base_url=None):
+        """First results page of a search, fetched by planner.py"""
+        raise NotImplementedError
+
+    def parse_probe(self, html):
+        """(total result count or None, job keys) from a first results page"""
+        raise NotImplementedError
+
+    def run(self, settings):
+        raise NotImplementedError
+
+    def session(self, settings):
+        """Page-at-a-time browser session for crawl_runner.py workers (see crawl_sessions.py)"""
+        raise NotImplementedError
+
+    def save(self, rows, output):
+        """Write rows in the site's usual CSV format (used when merging queue results)"""
+        raise NotImplementedError
+
+
+@register_site
+class IndeedSite(SitePlugin):
+    name = "indeed"
+    help = "Indeed (mosaic job-cards JSON)"
+    default_queries = ["python developer"]
+    default_location = "Remote"
+    default_pages = 38
+    total_patterns = [re.compile(r'"totalJobCount"\s*:\s*(\d+)'),
+                      re.compile(r'jobsearch-JobCountAndSortPane-jobCount.*?([\d,]+)\+?\s+jobs', re.DOTALL)]
+    key_pattern = re.compile(r'"jobkey"\s*:\s*"(\w+)"')
+
+    def probe_url(self, query, location, base_url=None):
+        return f"{base_url or 'https://www.indeed.com'}/jobs?q={quote_plus(query)}&l={quote_plus(location)}"
+
+    def parse_probe(self, html):
+        return _first_int(self.total_patterns, html), _unique(self.key_pattern.findall(html))
+
+    def run(self, settings):
+        import asyncio
+        import main as indeed
+
+        # One browser and quarantine for all searches: blocked pages never stall the next search
+        rows = asyncio.run(indeed.scrape_indeed(
+            self.searches(settings), base_url=settings["base_url"] or indeed.BASE_URL,
+            headless=settings["headless"], parse_workers=settings["parse_workers"],
+            profile=settings["profile"], block_cooldown=settings["block_cooldown"]))
+        # Keep the timestamped default name so a later save() (after --enrich) overwrites it
+        settings["output"] = indeed.save_jobs(rows, settings["output"]) or settings["output"]
+        return rows
+
+    def session(self, settings):
+        from crawl_sessions import IndeedSession
+        return IndeedSession(settings["base_url"], settings["headless"], settings["profile"])
+
+    def save(self, rows, output):
+        import main as indeed
+        indeed.save_jobs(rows, output)
+
+
+@register_site
+class MonsterSite(SitePlugin):
+    name = "monster"
+    help = "Monster (__NEXT_DATA__ jobResults)"
+    default_location = "Remote"
+    default_pages = 5
+    default_output = "monster_jobs_all.csv"
+    total_patterns = [re.compile(r'"estimatedTotalSize"\s*:\s*(\d+)'),
+                      re.compile(r'"totalSize"\s*:\s*(\d+)')]
+    key_pattern = re.compile(r'"jobId"\s*:\s*"([^"]+)"')
+
+    @property
+    def default_queries(self):
+        # mosnter_scrape defers its pandas/Playwright imports, so this is cheap
+        from mosnter_scrape import JOB_KEYWORDS
+        return JOB_KEYWORDS
+
+    def probe_url(self, query, location, base_url=None):
+        return (f"{base_url or 'https://www.monster.com'}/jobs/search"
+                f"?q={quote_plus(query)}&where={quote_plus(location)}&page=1&so=m.h.s")
+
+    def parse_probe(self, html):
+        return _first_int(self.total_patterns, html), _unique(self.key_pattern.findall(html))
+
+    def run(self, settings):
+        import mosnter_scrape
+
+        return mosnter_scrape.run(searches=self.searches(settings), output_file=settings["output"],
+                                  base_url=settings["base_url"] or mosnter_scrape.BASE_URL,
+                                  headless=settings["headless"], profile=settings["profile"],
+                                  block_cooldown=settings["block_cooldown"])
+
+    def session(self, settings):
+        from crawl_sessions import MonsterSession
+        return MonsterSession(settings["base_url"], settings["headless"], settings["profile"])
+
+    def save(self, rows, output):
+        import mosnter_scrape
+        mosnter_scrape.save_jobs(rows, output or self.default_output)
+
+
+@register_site
+class IIMJobsSite(SitePlugin):
+    name = "iim"
+    help = "IIMJobs (card HTML with /j/ links)"
+    default_queries = ["hr"]
+    default_pages = 10
+    default_output = "iimjobs_hr_jobs.csv"
+    # IIMJobs pages show no result total we can match: the planner sizes IIM
+    # searches from first-page overlap alone
+    total_patterns = []
+    key_pattern = re.compile(r'href="[^"]*/j/[^"?#]*?-(\d+)[?#/"]')
+
+    def settings(self, args, config):
+        settings = super().settings(args, config)
+        # Category URLs have no location: one search per query, whatever -l says
+        settings["locations"] = [""]
+        return settings
+
+    def probe_url(self, query, location, base_url=None):
+        # IIMJobs searches are category pages; the location is not part of the URL
+        slug = "-".join(query.lower().split())
+        return f"{base_url or 'https://www.iimjobs.com'}/search/{slug}-jobs?page=1"
+
+    def parse_probe(self, html):
+        return _first_int(self.total_patterns, html), _unique(self.key_pattern.findall(html))
+
+    def run(self, settings):
+        import asyncio
+        from iims_scraper import BASE_URL, IIMJobsScraper
+
+        # One scraper across queries so its title+company de-duplication spans them all
+        host = settings["base_url"] or BASE_URL
+        scraper = IIMJobsScraper(host=host, headless=settings["headless"],
+                                 parse_workers=settings["parse_workers"], profile=settings["profile"],
+                                 block_cooldown=settings["block_cooldown"])
+        # ...and one browser and quarantine: blocked pages never stall the next query
+        queries = [(query, pages) for query, _, pages in self.searches(settings)]
+        asyncio.run(scraper.scrape(output_file=settings["output"], queries=queries))
+        return scraper.jobs_data
+
+    def session(self, settings):
+        from crawl_sessions import IIMJobsSession
+        return IIMJobsSession(settings["base_url"], settings["headless"], settings["profile"])
+
+    def save(self, rows, output):
+        import asyncio
+        from iims_scraper import IIMJobsScraper
+
+        scraper = IIMJobsScraper()
+        scraper.add_jobs(rows)
+        asyncio.run(scraper.save_to_csv(output or self.default_output))
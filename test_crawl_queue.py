@@ -0,0 +1,75 @@
+"""Lease, retry and skip rules of the crawl task queue (python -m unittest test_crawl_queue)."""
+import os
+import tempfile
+import time
+import unittest
+
+from crawl_queue import TaskQueue
+
+
+class TaskQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "crawl.db")
+        self.queue = TaskQueue(self.path, lease_seconds=60)
+        self.queue.enqueue("monster", [("python", "Remote", page) for page in (1, 2, 3)])
+
+    def tearDown(self):
+        self.queue.close()
+        self.dir.cleanup()
+
+    def states(self):
+        rows = self.queue.conn.execute("SELECT page, state FROM tasks ORDER BY page")
+        return {row["page"]: row["state"] for row in rows}
+
+    def test_enqueue_ignores_known_tasks(self):
+        added = self.queue.enqueue("monster", [("python", "Remote", 3), ("python", "Remote", 4)])
+        self.assertEqual(added, 1)
+
+    def test_lease_hands_out_each_task_once(self):
+        first, second = self.queue.lease("w1"), self.queue.lease("w2")
+        self.assertEqual((first["page"], second["page"]), (1, 2))
+        self.assertEqual((first["worker"], first["attempts"]), ("w1", 1))
+
+    def test_expired_lease_is_reclaimed_and_the_old_worker_cannot_complete(self):
+        with TaskQueue(self.path, lease_seconds=0.01) as short:
+            task = short.lease("w1")
+        time.sleep(0.02)
+        again = self.queue.lease("w2")
+        self.assertEqual((again["id"], again["attempts"]), (task["id"], 2))
+        self.assertFalse(self.queue.heartbeat(task["id"], "w1"))
+        self.assertFalse(self.queue.complete(task["id"], "w1", [{"Job ID": "1"}]))
+        self.assertTrue(self.queue.complete(again["id"], "w2", [{"Job ID": "1"}]))
+        self.assertEqual(list(self.queue.rows("monster")), [{"Job ID": "1"}])
+
+    def test_reclaim_releases_a_dead_workers_leases(self):
+        self.queue.lease("host:1")
+        self.assertEqual(self.queue.reclaim("host:1"), 1)
+        self.assertEqual(self.queue.lease("host:2")["page"], 1)
+
+    def test_empty_page_skips_the_rest_of_the_search(self):
+        task = self.queue.lease("w1")
+        self.assertTrue(self.queue.complete(task["id"], "w1", []))
+        self.assertEqual(self.states(), {1: "done", 2: "skipped", 3: "skipped"})
+        self.assertEqual(self.queue.unfinished(), 0)
+
+    def test_retry_waits_then_fails_after_max_attempts(self):
+        task = self.queue.lease("w1")
+        self.queue.retry(task["id"], "w1", "blocked", delay=60, max_attempts=2)
+        self.assertEqual(self.queue.lease("w1")["page"], 2)  # page 1 is not due yet
+
+        self.queue.conn.execute("UPDATE tasks SET available_at = 0 WHERE id = ?", (task["id"],))
+        again = self.queue.lease("w1")
+        self.assertEqual((again["id"], again["attempts"]), (task["id"], 2))
+        self.queue.retry(again["id"], "w1", "blocked", delay=0, max_attempts=2)
+        self.assertEqual(self.states()[1], "failed")
+
+    def test_settings_keep_only_shared_keys(self):
+        self.queue.configure("monster", {"output": "m.csv", "block_cooldown": 5, "queries": ["python"]})
+        settings = self.queue.settings("monster")
+        self.assertEqual((settings["output"], settings["block_cooldown"]), ("m.csv", 5))
+        self.assertNotIn("queries", settings)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Card shapes for iim_cards.parse_card (python -m unittest test_iim_cards)."""
+import unittest
+from datetime import datetime
+
+from iim_cards import parse_card, posted_date
+
+NOW = datetime(2026, 2, 7, 20, 18, 22)
+
+# Raw card text as saved in iim_jobs_for_hr.csv: heading run together, then repeated
+CARD = ("Hindustan Coca Cola Beverages Plant HR Manager 12 - 18 yrs "
+        "Hindustan Coca Cola Beverages - Plant HR Manager Posted 3 days ago      2026-02-07 20:18:22  "
+        "Hindustan Coca Cola Beverages - Plant HR Manager "
+        "https://www.iimjobs.com/j/hindustan-coca-cola-beverages-plant-hr-manager-1671998?ref=sp_br_prm&jobPos=1 "
+        "4 3,379+ Reviews Hindustan Coca Cola Beverages - Plant HR Manager 12 - 18 yrs Maharashtra")
+
+
+class ParseCardTest(unittest.TestCase):
+    def test_saved_card(self):
+        job = parse_card(CARD)
+        self.assertEqual(job["company"], "Hindustan Coca Cola Beverages")
+        self.assertEqual(job["title"], "Plant HR Manager")
+        self.assertEqual((job["experience_min"], job["experience_max"]), (12, 18))
+        self.assertEqual(job["location"], "Maharashtra")
+        self.assertEqual((job["rating"], job["reviews"]), (4.0, 3379))
+        self.assertEqual(job["posted_date"], "2026-02-04")  # relative to the scrape timestamp
+        self.assertTrue(job["url"].startswith("https://www.iimjobs.com/j/"))
+        self.assertNotIn("http", job["text"])
+
+    def test_just_now_with_extra_whitespace(self):
+        for text in ("Acme - HR Lead 3 - 5 yrs Mumbai Posted just  now",
+                     "Acme - HR Lead 3 - 5 yrs Mumbai Posted just\nnow"):
+            job = parse_card(text, now=NOW)
+            self.assertEqual(job["posted_relative"], "just now")
+            self.assertEqual(job["posted_date"], "2026-02-07")
+            self.assertEqual(job["location"], "Mumbai")
+
+    def test_posted_is_case_insensitive(self):
+        job = parse_card("Acme - HR Lead 3 - 5 yrs Mumbai Posted Today", now=NOW)
+        self.assertEqual(job["location"], "Mumbai")
+        self.assertEqual(job["posted_date"], "2026-02-07")
+        job = parse_card("Acme - HR Lead 3 - 5 yrs . Pune POSTED 2 Days Ago", now=NOW)
+        self.assertEqual(job["location"], "Pune")
+        self.assertEqual(job["posted_date"], "2026-02-05")
+
+    def test_confidential_posting_has_no_company(self):
+        job = parse_card("HR Business Partner\n8 - 12 yrs\nBangalore\nPosted yesterday", now=NOW)
+        self.assertEqual((job["company"], job["title"]), ("", "HR Business Partner"))
+        self.assertEqual(job["location"], "Bangalore")
+        self.assertEqual(job["posted_date"], "2026-02-06")
+
+    def test_empty_text(self):
+        job = parse_card("")
+        self.assertEqual((job["title"], job["text"]), ("", ""))
+        self.assertIsNone(job["experience_min"])
+
+
+class PostedDateTest(unittest.TestCase):
+    def test_known_forms(self):
+        self.assertEqual(posted_date("a week ago", NOW), "2026-01-31")
+        self.assertEqual(posted_date("30+ days ago", NOW), "2026-01-08")
+        self.assertEqual(posted_date("5 hours ago", NOW), "2026-02-07")
+
+    def test_unknown_input_is_empty(self):
+        for text in ("", "soon", "just", "few days ago", "3 fortnights ago"):
+            self.assertEqual(posted_date(text, NOW), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+"""Salary normalisation across sources (python -m unittest test_job_query)."""
+import math
+import unittest
+
+from job_query import JobIndex, normalize, salary_from_text
+
+
+class SalaryTest(unittest.TestCase):
+    def test_structured_indeed_salary(self):
+        row = {"Salary_Text": "40 - 60 (HOURLY)", "Salary_Min": 40, "Salary_Max": 60}
+        self.assertEqual(normalize(row)["salary"], 60 * 2080)
+
+    def test_display_text(self):
+        self.assertEqual(normalize({"Salary": "$60,000 - $90,000 / year"})["salary"], 90000)
+        self.assertEqual(normalize({"Salary_Text": "$25 an hour"})["salary"], 25 * 2080)
+        self.assertEqual(normalize({"Salary": "Up to $5,000 a month"})["salary"], 60000)
+        self.assertEqual(normalize({"salary": "10 - 15 LPA"})["salary"], 1500000)
+        self.assertEqual(salary_from_text("90k - 120k"), 120000)
+
+    def test_missing_salary(self):
+        self.assertTrue(math.isnan(normalize({"Salary": "N/A"})["salary"]))
+        self.assertTrue(math.isnan(normalize({"salary": ""})["salary"]))
+
+    def test_min_salary_covers_every_source(self):
+        index = JobIndex.from_rows([
+            {"Title": "Indeed", "Salary_Text": "100000 - 120000 (YEARLY)", "Salary_Min": 100000, "Salary_Max": 120000},
+            {"Title": "Monster", "Salary": "$60,000 - $90,000 / year"},
+            {"title": "IIM", "salary": "10 - 15 LPA"},
+            {"Title": "Unknown", "Salary": "N/A"},
+        ])
+        titles = {row.get("Title") or row.get("title") for row in index.query(min_salary=80000)}
+        self.assertEqual(titles, {"Indeed", "Monster", "IIM"})
+
+
+if __name__ == "__main__":
+    unittest.main()
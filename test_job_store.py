@@ -0,0 +1,39 @@
+"""Upsert merge semantics of the SQLite master store (python -m unittest test_job_store)."""
+import os
+import tempfile
+import unittest
+
+from job_store import JobStore
+
+
+class UpsertTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.dir.name, "jobs.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.dir.cleanup()
+
+    def stored(self):
+        return [{k: v for k, v in row.items() if k not in ("first_seen", "last_seen")}
+                for row in self.store.iter_jobs("indeed")]
+
+    def test_enriched_fields_survive_a_listing_only_run(self):
+        self.store.upsert("indeed", [{"Job_Key": "a", "Title": "Dev", "Full_Description": "Long text"}])
+        self.store.upsert("indeed", [{"Job_Key": "a", "Title": "Senior Dev"}])
+        [row] = self.stored()
+        self.assertEqual((row["Title"], row["Full_Description"], row["seen_count"]), ("Senior Dev", "Long text", 2))
+
+    def test_none_fields_are_never_stored(self):
+        self.store.upsert("indeed", [{"Job_Key": "a", "Salary_Min": None, "Salary_Max": None}])
+        self.assertNotIn("Salary_Min", self.stored()[0])
+        self.store.upsert("indeed", [{"Job_Key": "b", "Salary_Min": 100, "Salary_Max": 120}])
+        self.store.upsert("indeed", [{"Job_Key": "b", "Salary_Min": None, "Salary_Max": None}])
+        # A run that did not fill a field keeps its last known value
+        row = next(r for r in self.stored() if r["job_key"] == "b")
+        self.assertEqual((row["Salary_Min"], row["Salary_Max"]), (100, 120))
+
+
+if __name__ == "__main__":
+    unittest.main()